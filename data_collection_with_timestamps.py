@@ -3,19 +3,49 @@ Enhanced Motor Data Collection Script with Timestamps
 ======================================================
 Collects sensor data from Arduino and saves with Unix timestamps (seconds since epoch).
 This format is compact and optimal for feature extraction and time-series analysis.
+
+Each CSV row is: timestamp,ax_g,ay_g,az_g,temp_C where timestamp is the
+time.time_ns() capture time written as seconds.nanoseconds since the epoch.
 """
 
+import argparse
 import serial
 import time
-import datetime
+import json
 import os
 import sys
+import struct
+import signal
+import threading
+from collections import deque
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 SERIAL_PORT = 'COM4'  # Change to your Arduino port (use 'ls /dev/tty.*' on Mac/Linux)
 BAUD_RATE = 115200  # Standard baud rate for motor monitoring
+FIELDS = ['ax_g', 'ay_g', 'az_g', 'temp_C']  # comma-separated values the Arduino sends per line
+
+FLUSH_INTERVAL = 1.0  # seconds between writes to disk (bounds data loss on crash)
+BATCH_BYTES = 1 << 16  # formatted bytes accumulated in memory before a single write()
+READ_TIMEOUT = 0.01  # seconds a blocking serial read waits for a line
+STARTUP_TIMEOUT = 5.0  # seconds to wait for the first line before warning
+RX_BUFFER_SIZE = 1 << 20  # driver receive buffer requested on Windows (absorbs writer stalls)
+QUEUE_SIZE = 8192  # lines buffered between reader and writer threads (oldest dropped when full)
+DRAIN_SIZE = 256  # max lines the writer takes from the ring per pass
+ERROR_REPORT_EVERY = 100  # print only every Nth malformed line
+PROGRESS_INTERVAL = 1.0  # seconds between progress lines on the console
+ROTATE_MB = 64  # start a new _partNNN file after this many MiB (0 = never rotate)
+
+OUTPUT_FORMAT = 'csv'  # 'csv' (text, one row per line) or 'binary' (fixed-size records, see below)
+# Binary record layout: little-endian int64 timestamp in ns since epoch,
+# then ax, ay, az, temp as int16 counts (16 bytes per reading vs ~55 as text).
+# The ±2 g accelerometer range fits int16 at 0.0001 g/count (±3.27 g max) and
+# temperature at 0.01 °C/count; the scales are also written to a .json sidecar
+BINARY_RECORD = struct.Struct('<qhhhh')
+BINARY_DTYPE = [('timestamp_ns', '<i8'), ('ax', '<i2'), ('ay', '<i2'), ('az', '<i2'), ('temp', '<i2')]
+ACCEL_COUNTS_PER_G = 10000
+TEMP_COUNTS_PER_C = 100
 
 SAMPLING_INTERVAL = 0.0  # seconds between readings (0 = as fast as Arduino sends, ~10 Hz)
 # Arduino sends data every 100ms (10 Hz), which is suitable for:
@@ -27,20 +57,164 @@ SAMPLING_INTERVAL = 0.0  # seconds between readings (0 = as fast as Arduino send
 # ============================================================================
 # SETUP
 # ============================================================================
-def setup_data_collection():
+def _to_int16(value):
+    """Round a scaled reading to int16 counts, saturating at the type limits"""
+    return max(-32768, min(32767, round(value)))
+
+
+def write_all(fd, buf):
+    """
+    Write a whole buffer to a raw file descriptor.
+    
+    os.write() may write fewer bytes than requested, so keep going from
+    where it stopped (a memoryview slice avoids copying the remainder).
+    
+    Args:
+        fd: File descriptor from os.open()
+        buf: bytes or bytearray to write
+    """
+    view = memoryview(buf)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def part_filename(filename, part):
+    """Name of the Nth output file of a session (part 0 keeps the original name)"""
+    if part == 0:
+        return filename
+    root, extension = os.path.splitext(filename)
+    return f"{root}_part{part:03d}{extension}"
+
+
+def open_output_file(filename, fields, binary):
+    """
+    Create an output file and write its CSV header (or binary sidecar).
+    
+    Args:
+        filename: Path of the file to create
+        fields: Names of the values in each row
+        binary: True for fixed-size binary records, False for CSV
+        
+    Returns:
+        Tuple of (file descriptor, bytes written)
+    """
+    # Raw file descriptor: rows are already batched in our own buffer, so the
+    # io.BufferedWriter layer (and its lock) would only add per-write overhead
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    if hasattr(os, 'posix_fadvise'):
+        # Sequential append-only writer: let the kernel write back aggressively
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    
+    # Binary files are headerless so np.fromfile can map them directly
+    if binary:
+        write_binary_sidecar(filename)
+        return fd, 0
+    header = ','.join(['timestamp'] + list(fields)).encode('ascii') + b'\n'
+    write_all(fd, header)
+    return fd, len(header)
+
+
+def close_output_file(fd, filename, manifest):
+    """
+    Make a finished output file durable and list it in the session manifest.
+    
+    Args:
+        fd: File descriptor from open_output_file()
+        filename: Path of the finished file
+        manifest: Path of the manifest, one completed file name per line
+    """
+    os.fsync(fd)
+    os.close(fd)
+    with open(manifest, 'a') as f:
+        f.write(os.path.basename(filename) + '\n')
+
+
+def write_binary_sidecar(filename):
+    """
+    Write the record layout and scale factors next to a binary data file.
+    
+    Args:
+        filename: Path to the .bin data file
+        
+    Returns:
+        Path of the .json sidecar
+    """
+    sidecar = os.path.splitext(filename)[0] + '.json'
+    with open(sidecar, 'w') as f:
+        json.dump({
+            'record_format': BINARY_RECORD.format,
+            'fields': [name for name, _ in BINARY_DTYPE],
+            'timestamp_unit': 'ns',
+            'accel_scale_g': 1.0 / ACCEL_COUNTS_PER_G,
+            'temp_scale_C': 1.0 / TEMP_COUNTS_PER_C,
+        }, f, indent=2)
+    return sidecar
+
+
+def enable_low_latency(ser):
+    """
+    Ask the USB-serial driver to hand over bytes immediately.
+    
+    FTDI-style adapters otherwise hold incoming bytes for their latency timer
+    (16 ms by default), so lines arrive in bursts. pyserial exposes the Linux
+    ASYNC_LOW_LATENCY flag as set_low_latency_mode(); other platforms don't
+    support it (on Windows the driver's own latency timer setting applies).
+    The two are complementary on Linux: FTDI adapters also expose the timer
+    as /sys/bus/usb-serial/devices/<ttyUSBn>/latency_timer, which can be
+    lowered to 1 (ms) with root privileges.
+    
+    Returns:
+        True if low-latency mode was enabled, False otherwise
+    """
+    set_low_latency_mode = getattr(ser, 'set_low_latency_mode', None)
+    if set_low_latency_mode is None:
+        return False
+    try:
+        set_low_latency_mode(True)
+        return True
+    except (OSError, ValueError, NotImplementedError):
+        # Unsupported driver/platform or insufficient permissions
+        return False
+
+
+def enlarge_rx_buffer(ser):
+    """
+    Ask the serial driver for a larger receive buffer.
+    
+    Only the Windows backend of pyserial implements set_buffer_size(); the
+    default ring there is small enough to overflow during a GC pause or a
+    slow disk write. On Linux the tty layer buffers generously already.
+    
+    Returns:
+        True if the buffer size was set, False otherwise
+    """
+    set_buffer_size = getattr(ser, 'set_buffer_size', None)
+    if set_buffer_size is None:
+        return False
+    try:
+        set_buffer_size(rx_size=RX_BUFFER_SIZE, tx_size=1 << 12)
+        return True
+    except (OSError, ValueError, serial.SerialException):
+        return False
+
+
+def setup_data_collection(port=SERIAL_PORT, baud_rate=BAUD_RATE, fields=FIELDS,
+                          output_format=OUTPUT_FORMAT, sampling_interval=SAMPLING_INTERVAL):
     """Initialize serial connection and create output file"""
     
     # Create filename with date and time
-    now = datetime.datetime.now()
-    filename = now.strftime("motor_data_%Y%m%d_%H%M%S.csv")
+    extension = 'bin' if output_format == 'binary' else 'csv'
+    filename = time.strftime(f"motor_data_%Y%m%d_%H%M%S.{extension}")
     
     print("="*70)
     print(" MOTOR DATA COLLECTION - STARTED")
     print("="*70)
-    print(f"📁 Output file: {filename}")
-    print(f"🔌 Serial port: {SERIAL_PORT}")
-    print(f"⚡ Baud rate: {BAUD_RATE}")
-    print(f"⏱️  Sampling interval: {SAMPLING_INTERVAL}s")
+    print(f"📁 Output file: {filename} ({output_format})")
+    print(f"🔌 Serial port: {port}")
+    print(f"⚡ Baud rate: {baud_rate}")
+    print(f"📋 Fields: {','.join(fields)}")
+    print(f"⏱️  Sampling interval: {sampling_interval}s")
     print("="*70)
     print("\n⚠️  IMPORTANT: Make sure Arduino/ESP32 is running first!")
     print("   The Arduino code must be uploaded and running before starting this script.")
@@ -49,36 +223,41 @@ def setup_data_collection():
     # Initialize serial connection
     try:
         print("🔌 Connecting to Arduino...")
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+        ser = serial.Serial(port, baud_rate, timeout=1)
         time.sleep(2)  # Wait for Arduino to initialize
         print("✓ Serial connection established")
         
-        # Clear any buffered data
+        if enable_low_latency(ser):
+            print("✓ Low-latency mode enabled")
+        if enlarge_rx_buffer(ser):
+            print(f"✓ Receive buffer set to {RX_BUFFER_SIZE >> 10} KiB")
+        
+        # Clear any buffered data (once, at startup only: resetting later
+        # would silently discard samples)
         ser.reset_input_buffer()
         time.sleep(0.5)
         
-        # Verify Arduino is sending data
+        # Verify Arduino is sending data: one blocking read (bounded by the
+        # timeout) instead of polling in_waiting, which costs an ioctl per check
+        # The line read here is discarded; after the reset it may be partial anyway
         print("⏳ Waiting for data from Arduino...")
-        wait_start = time.time()
-        while ser.in_waiting == 0:
-            if time.time() - wait_start > 5:
-                print("⚠️  WARNING: No data received from Arduino after 5 seconds")
-                print("   Make sure:")
-                print("   1. Arduino code is uploaded and running")
-                print("   2. Baud rate matches (should be 115200)")
-                print("   3. Arduino is sending data in format: ax_g,ay_g,az_g,temp_C")
-                break
-            time.sleep(0.1)
-        
-        if ser.in_waiting > 0:
+        ser.timeout = STARTUP_TIMEOUT
+        first_line = ser.read_until(b'\n')
+        
+        if first_line:
             print("✓ Arduino is sending data!\n")
         else:
+            print(f"⚠️  WARNING: No data received from Arduino after {STARTUP_TIMEOUT:.0f} seconds")
+            print("   Make sure:")
+            print("   1. Arduino code is uploaded and running")
+            print(f"   2. Baud rate matches (should be {baud_rate})")
+            print(f"   3. Arduino is sending data in format: {','.join(fields)}")
             print("⚠️  Proceeding anyway, but Arduino may not be ready\n")
             
     except Exception as e:
         print(f"❌ Error connecting to serial port: {e}")
         print(f"\n   Troubleshooting:")
-        print(f"   1. Make sure Arduino/ESP32 is connected to {SERIAL_PORT}")
+        print(f"   1. Make sure Arduino/ESP32 is connected to {port}")
         print(f"   2. Upload and run the Arduino code first")
         print(f"   3. Check if the port name is correct (use 'ls /dev/tty.*' on Mac/Linux)")
         print(f"   4. Close any other programs using the serial port (Arduino IDE Serial Monitor)")
@@ -89,102 +268,323 @@ def setup_data_collection():
 # ============================================================================
 # DATA COLLECTION LOOP
 # ============================================================================
-def collect_data():
-    """Main data collection loop"""
+def read_serial_lines(ser, lines, data_ready, stop_event, stats, sampling_interval=SAMPLING_INTERVAL):
+    """
+    Reader thread: block on the serial port and queue timestamped lines.
+    
+    This thread only reads and timestamps, so a slow disk write in the
+    writer can never hold up the port and overrun its input buffer.
     
-    ser, filename = setup_data_collection()
+    Args:
+        ser: Open serial port
+        lines: deque(maxlen=QUEUE_SIZE) shared with the writer
+        data_ready: Event set whenever a line is appended
+        stop_event: Event that ends the loop
+        stats: Dictionary whose 'dropped' count is incremented when the ring overflows
+        sampling_interval: Seconds to sleep after each reading
+    """
+    pending = b''  # partial line left over from a read timeout
+    
+    while not stop_event.is_set():
+        try:
+            # Block until a newline arrives (bounded by READ_TIMEOUT)
+            raw = ser.read_until(b'\n')
+        except serial.SerialException as e:
+            print(f"\n❌ Serial read failed: {e}")
+            stop_event.set()
+            break
+        
+        if not raw:
+            continue
+        
+        # A timeout can split a line; hold the fragment until it completes
+        if not raw.endswith(b'\n'):
+            pending += raw
+            continue
+        
+        # Capture timestamp IMMEDIATELY after reading data
+        # Use time.time_ns() which provides an exact integer (no float rounding)
+        # Unix timestamp format (seconds since epoch) is optimal for:
+        # - Time-series analysis (pandas, numpy)
+        # - Feature extraction (time deltas, rolling windows)
+        # - Plotting and visualization
+        # - Machine learning model training
+        ts_ns = time.time_ns()
+        
+        if pending:
+            raw = pending + raw
+            pending = b''
+        
+        # Single producer / single consumer: deque append/popleft are atomic,
+        # so no lock is taken per line. A full ring drops its oldest line
+        # rather than blocking the port
+        if len(lines) == lines.maxlen:
+            stats['dropped'] += 1
+        lines.append((ts_ns, raw))
+        data_ready.set()
+        
+        # Control sampling rate AFTER reading (prevents data loss)
+        if sampling_interval > 0:
+            time.sleep(sampling_interval)
+
+
+def collect_data(port=SERIAL_PORT, baud_rate=BAUD_RATE, fields=FIELDS,
+                 output_format=OUTPUT_FORMAT, sampling_interval=SAMPLING_INTERVAL,
+                 rotate_mb=ROTATE_MB):
+    """
+    Main data collection loop (writer side; the port is read on a separate thread).
+    
+    Args:
+        port: Serial port the Arduino is connected to
+        baud_rate: Serial baud rate (must match the Arduino sketch)
+        fields: Names of the comma-separated values in each line
+        output_format: 'csv' or 'binary' (binary requires the default FIELDS)
+        sampling_interval: Seconds to sleep after each reading (0 = as fast as sent)
+        rotate_mb: Start a new _partNNN file after this many MiB (0 = never rotate)
+    """
+    ser, filename = setup_data_collection(port, baud_rate, fields, output_format, sampling_interval)
+    expected_commas = len(fields) - 1
+    
+    # The Arduino payload is plain ASCII, so lines are kept as bytes end to
+    # end and never decoded
+    binary = output_format == 'binary'
+    fd, bytes_written = open_output_file(filename, fields, binary)
+    batch = bytearray()  # reusable buffer of formatted rows waiting to be written
+    
+    # Bounded ring between the reader thread and this writer loop
+    lines = deque(maxlen=QUEUE_SIZE)
+    data_ready = threading.Event()
+    stop_event = threading.Event()
+    stats = {'dropped': 0}
+    reader = threading.Thread(target=read_serial_lines,
+                              args=(ser, lines, data_ready, stop_event, stats, sampling_interval),
+                              daemon=True)
+    
+    # Ctrl+C only asks the reader to stop; lines already queued are still written
+    previous_sigint = signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    
+    # Long sessions are split into parts of at most rotate_mb each; every
+    # completed part is appended to the manifest so downstream tools can
+    # process it while collection continues
+    manifest = os.path.splitext(filename)[0] + '_manifest.txt'
+    rotate_bytes = rotate_mb << 20
+    part = 0
+    current_file = filename
     
     try:
-        with open(filename, 'w') as file:
-            # Write CSV header
-            file.write("timestamp,ax_g,ay_g,az_g,temp_C\n")
-            
-            reading_count = 0
-            error_count = 0
-            start_time = time.time()
+        reading_count = 0
+        error_count = 0
+        
+        # Durations use the monotonic clock (immune to NTP/wall-clock jumps) in
+        # integer ns; time.time_ns() is kept only for the recorded sample timestamps
+        start_ns = time.monotonic_ns()
+        last_print_ns = start_ns
+        last_print_count = 0
+        latest = b''  # most recent valid line, shown in progress output
+        last_flush_ns = start_ns
+        flush_interval_ns = int(FLUSH_INTERVAL * 1_000_000_000)
+        progress_interval_ns = int(PROGRESS_INTERVAL * 1_000_000_000)
+        
+        print("📊 Collecting data...\n")
+        
+        # The reader blocks on the port until a full line arrives instead of
+        # polling in_waiting; the short timeout keeps Ctrl+C responsive
+        ser.timeout = READ_TIMEOUT
+        reader.start()
+        
+        while reader.is_alive() or lines:
+            if not lines:
+                data_ready.wait(timeout=0.1)
+                data_ready.clear()
+                
+                # Keep the flush timer running while the stream is stalled, so
+                # rows already received are not held in memory indefinitely
+                now_ns = time.monotonic_ns()
+                if batch and now_ns - last_flush_ns >= flush_interval_ns:
+                    write_all(fd, batch)
+                    bytes_written += len(batch)
+                    batch.clear()
+                    last_flush_ns = now_ns
+                continue
             
-            print("📊 Collecting data...\n")
+            # Drain whatever is already queued in one pass
+            items = [lines.popleft() for _ in range(min(len(lines), DRAIN_SIZE))]
             
-            while True:
-                if ser.in_waiting > 0:
+            for ts_ns, raw in items:
+                data = raw.rstrip(b'\r\n')
+                
+                # Validate data
+                if not data:
+                    error_count += 1
+                    continue
+                
+                # Check if data has correct number of columns (one value per field)
+                # Counting commas is a single C-level scan with no split() list
+                if data.count(b',') != expected_commas:
+                    error_count += 1
+                    # Report the first malformed line and then every Nth, so a noisy
+                    # link cannot turn console output into the bottleneck
+                    if (error_count - 1) % ERROR_REPORT_EVERY == 0:
+                        print(f"⚠️  Malformed data (expected {len(fields)} values, got {data.count(b',') + 1}): "
+                              f"{data.decode('ascii', 'replace')} [{error_count} errors so far]")
+                    continue
+                
+                if binary:
+                    # float() parses the ASCII bytes directly (no decode)
                     try:
-                        # Read data from Arduino first
-                        data = ser.readline().decode('utf-8').strip()
-                        
-                        # Capture timestamp IMMEDIATELY after reading data
-                        # Use time.time() which provides microsecond precision (float)
-                        # Unix timestamp format (seconds since epoch) is optimal for:
-                        # - Time-series analysis (pandas, numpy)
-                        # - Feature extraction (time deltas, rolling windows)
-                        # - Plotting and visualization
-                        # - Machine learning model training
-                        timestamp = time.time()
-                        
-                        # Validate data
-                        if not data or ',' not in data:
-                            error_count += 1
-                            continue
-                        
-                        # Check if data has correct number of columns (4 values expected: ax, ay, az, temp)
-                        data_parts = data.split(',')
-                        if len(data_parts) != 4:
-                            print(f"⚠️  Malformed data (expected 4 values, got {len(data_parts)}): {data}")
-                            error_count += 1
-                            continue
-                        
-                        # Write timestamped data with sufficient decimal precision
-                        # Use .9f format to preserve microsecond precision (9 decimal places)
-                        # This ensures accurate time-series analysis even at high sampling rates
-                        full_data = f"{timestamp:.9f},{data}"
-                        file.write(full_data + '\n')
-                        file.flush()  # Force write to disk
-                        
-                        reading_count += 1
-                        
-                        # Print progress every 10 readings
-                        if reading_count % 10 == 0:
-                            elapsed = time.time() - start_time
-                            rate = reading_count / elapsed if elapsed > 0 else 0
-                            print(f"✓ Reading #{reading_count:4d} | Rate: {rate:.1f} Hz | Latest: {data}")
-                        
-                        # Control sampling rate AFTER reading (prevents data loss)
-                        if SAMPLING_INTERVAL > 0:
-                            time.sleep(SAMPLING_INTERVAL)
-                        
-                    except UnicodeDecodeError:
-                        error_count += 1
-                        print("⚠️  Unicode decode error - skipping reading")
-                        continue
-                    except Exception as e:
+                        ax, ay, az, temp = map(float, data.split(b','))
+                    except ValueError:
                         error_count += 1
-                        print(f"⚠️  Error reading data: {e}")
                         continue
-                else:
-                    # Small delay when no data available to avoid CPU spinning
-                    time.sleep(0.001)
-    
-    except KeyboardInterrupt:
-        elapsed = time.time() - start_time
+                    batch += BINARY_RECORD.pack(
+                        ts_ns,
+                        _to_int16(ax * ACCEL_COUNTS_PER_G),
+                        _to_int16(ay * ACCEL_COUNTS_PER_G),
+                        _to_int16(az * ACCEL_COUNTS_PER_G),
+                        _to_int16(temp * TEMP_COUNTS_PER_C),
+                    )
+                    reading_count += 1
+                    latest = data
+                    continue
+                
+                # Write timestamped data with sufficient decimal precision
+                # Seconds and nanoseconds are formatted as integers (9 decimal places),
+                # which avoids a float-to-decimal conversion on every row
+                # This ensures accurate time-series analysis even at high sampling rates
+                # Rows are appended in place to one reused buffer (no per-row string)
+                sec, nsec = divmod(ts_ns, 1_000_000_000)
+                batch += b"%d.%09d," % (sec, nsec)
+                batch += data
+                batch += b'\n'
+                
+                reading_count += 1
+                latest = data
+            
+            now_ns = time.monotonic_ns()
+            
+            # Print progress at most once per PROGRESS_INTERVAL, with the rate
+            # measured since the previous report rather than since start
+            if now_ns - last_print_ns >= progress_interval_ns:
+                rate = (reading_count - last_print_count) * 1e9 / (now_ns - last_print_ns)
+                print(f"✓ Reading #{reading_count:4d} | Rate: {rate:.1f} Hz | Latest: {latest.decode('ascii', 'replace')}")
+                last_print_ns = now_ns
+                last_print_count = reading_count
+            
+            # Write rows in batches, and on a timer rather than per line
+            # to bound data loss on a crash
+            flush_due = now_ns - last_flush_ns >= flush_interval_ns
+            if len(batch) >= BATCH_BYTES or flush_due:
+                write_all(fd, batch)
+                bytes_written += len(batch)
+                batch.clear()
+                if flush_due:
+                    last_flush_ns = now_ns
+            
+            if rotate_bytes and bytes_written >= rotate_bytes:
+                close_output_file(fd, current_file, manifest)
+                fd = None
+                part += 1
+                current_file = part_filename(filename, part)
+                fd, bytes_written = open_output_file(current_file, fields, binary)
+                print(f"📁 Rotated to {current_file}")
+        
+        # Reader has stopped and the ring is drained: make everything
+        # collected so far durable before reporting
+        write_all(fd, batch)
+        batch.clear()
+        close_output_file(fd, current_file, manifest)
+        fd = None
+        
+        elapsed = (time.monotonic_ns() - start_ns) / 1e9
         print("\n" + "="*70)
         print(" DATA COLLECTION STOPPED")
         print("="*70)
         print(f"📊 Total readings: {reading_count}")
         print(f"⚠️  Errors/skipped: {error_count}")
+        if stats['dropped']:
+            print(f"⚠️  Dropped (writer fell behind): {stats['dropped']}")
         print(f"⏱️  Duration: {elapsed/60:.1f} minutes")
         print(f"📈 Average rate: {reading_count/elapsed:.2f} readings/sec")
-        print(f"💾 Data saved to: {filename}")
+        if part:
+            print(f"💾 Data saved to: {part + 1} files, listed in {manifest}")
+        else:
+            print(f"💾 Data saved to: {filename}")
         print("="*70)
         
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
         
     finally:
+        signal.signal(signal.SIGINT, previous_sigint)
+        stop_event.set()
+        if reader.is_alive():
+            reader.join(timeout=1.0)
+        if fd is not None:
+            if batch:
+                write_all(fd, batch)
+            os.close(fd)
         ser.close()
         print("\n✓ Serial port closed")
 
+
+def load_binary_data(filename):
+    """
+    Load a file written with OUTPUT_FORMAT = 'binary'.
+    
+    Args:
+        filename: Path to the .bin file
+        
+    Returns:
+        Dictionary with 'timestamp' (seconds since epoch, float64) and
+        'ax_g', 'ay_g', 'az_g', 'temp_C' (float32, scaled from int16 counts)
+    """
+    # NumPy is only needed to read recordings back, not to collect them
+    import numpy as np
+    
+    accel_scale = 1.0 / ACCEL_COUNTS_PER_G
+    temp_scale = 1.0 / TEMP_COUNTS_PER_C
+    sidecar = os.path.splitext(filename)[0] + '.json'
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            meta = json.load(f)
+        accel_scale = meta.get('accel_scale_g', accel_scale)
+        temp_scale = meta.get('temp_scale_C', temp_scale)
+    
+    records = np.fromfile(filename, dtype=np.dtype(BINARY_DTYPE))
+    return {
+        'timestamp': records['timestamp_ns'] / 1e9,
+        'ax_g': records['ax'].astype(np.float32) * np.float32(accel_scale),
+        'ay_g': records['ay'].astype(np.float32) * np.float32(accel_scale),
+        'az_g': records['az'].astype(np.float32) * np.float32(accel_scale),
+        'temp_C': records['temp'].astype(np.float32) * np.float32(temp_scale),
+    }
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
+def parse_args():
+    """Parse command-line options (defaults come from the CONFIGURATION section)"""
+    parser = argparse.ArgumentParser(description="Collect timestamped motor sensor data from Arduino")
+    parser.add_argument('--port', default=SERIAL_PORT, help=f"serial port (default: {SERIAL_PORT})")
+    parser.add_argument('--baud', type=int, default=BAUD_RATE, help=f"baud rate (default: {BAUD_RATE})")
+    parser.add_argument('--fields', default=','.join(FIELDS),
+                        help=f"comma-separated value names sent per line (default: {','.join(FIELDS)})")
+    parser.add_argument('--format', choices=['csv', 'binary'], default=OUTPUT_FORMAT,
+                        help=f"output file format (default: {OUTPUT_FORMAT})")
+    parser.add_argument('--interval', type=float, default=SAMPLING_INTERVAL,
+                        help="seconds to wait after each reading (default: 0 = as fast as the Arduino sends)")
+    parser.add_argument('--rotate-mb', type=int, default=ROTATE_MB,
+                        help=f"start a new output file after this many MiB, 0 = never (default: {ROTATE_MB})")
+    args = parser.parse_args()
+    
+    args.fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+    if args.format == 'binary' and args.fields != FIELDS:
+        parser.error(f"--format binary only supports the default fields {','.join(FIELDS)}")
+    return args
+
+
 if __name__ == "__main__":
-    collect_data()
+    args = parse_args()
+    collect_data(args.port, args.baud, args.fields, args.format, args.interval, args.rotate_mb)
 
@@ -5,16 +5,93 @@ Rule-based anomaly detection and health scoring for motor monitoring.
 No ML, purely interpretable statistical analysis.
 """
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, NamedTuple, Tuple
 from utils import (
-    compute_vibration_magnitude_array,
-    compute_temperature_slope,
-    compute_z_score,
+    compute_vibration_stats,
+    compute_temperature_stats,
     health_score_from_z,
+    health_score_from_z_array,
     get_state_from_health
 )
 
 
+class VibrationMetrics(NamedTuple):
+    """
+    Vibration analysis results for one window.
+    """
+    mean: float
+    std: float
+    max: float
+    z_score: float
+    health_score: float
+    state: str
+    color: str
+
+
+class TemperatureMetrics(NamedTuple):
+    """
+    Temperature analysis results for one window.
+    """
+    mean: float
+    std: float
+    slope: float
+    z_score: float  # Not used, kept for compatibility
+    z_score_mean: float  # Not used
+    z_score_rate: float  # Not used
+    health_score: float
+    state: str
+    color: str
+
+
+# Disconnected sensor (reads ~0 °C): considered healthy (ignored)
+SENSOR_OFF_TEMPERATURE = TemperatureMetrics(
+    mean=0.0, std=0.0, slope=0.0,
+    z_score=0.0, z_score_mean=0.0, z_score_rate=0.0,
+    health_score=100.0, state='Sensor Off', color='#8E8E93'  # Grey
+)
+
+
+# Diagnostic message per vibration / temperature class (see
+# AnomalyEngine._classify_vibration and _classify_temperature); temperature
+# templates are filled with the window's mean (°C) and slope (°C/s)
+VIBRATION_MESSAGES = {
+    'normal': "✅ Vibration within normal range",
+    'elevated': "⚠️ Vibration elevated above normal",
+    'low': "⚠️ Vibration unusually low",
+    'high': "🚨 High vibration detected!",
+    'very_low': "🚨 Abnormally low vibration!",
+}
+
+TEMPERATURE_MESSAGES = {
+    'off': "⚪ Temperature sensor disconnected",
+    'critical_high': "🚨 Temperature CRITICAL HIGH ({mean:.1f}°C) - Absolute limit exceeded!",
+    'critical_low': "🚨 Temperature CRITICAL LOW ({mean:.1f}°C) - Absolute limit exceeded!",
+    'stable': "✅ Temperature stable ({mean:.1f}°C, {slope:+.3f}°C/s)",
+    'rising': "⚠️ Temperature rising rapidly ({mean:.1f}°C, {slope:+.3f}°C/s)",
+    'dropping': "⚠️ Temperature dropping rapidly ({mean:.1f}°C, {slope:+.3f}°C/s)",
+    'rising_fast': "🚨 Temperature rising DANGEROUSLY FAST ({mean:.1f}°C, {slope:+.3f}°C/s)!",
+    'dropping_fast': "🚨 Temperature dropping DANGEROUSLY FAST ({mean:.1f}°C, {slope:+.3f}°C/s)!",
+}
+
+
+class WindowView:
+    """
+    Analysis window: views of the most recent samples of each channel.
+    
+    One instance is kept per engine and rebound every frame, so windowing
+    allocates no dict (__slots__ also keeps attribute access cheap).
+    """
+    __slots__ = ('timestamps', 'ax', 'ay', 'az', 'temp')
+    
+    def __init__(self):
+        empty = np.empty(0)
+        self.timestamps = empty
+        self.ax = empty
+        self.ay = empty
+        self.az = empty
+        self.temp = empty
+
+
 class AnomalyEngine:
     """
     Rule-based anomaly detection engine for motor health monitoring.
@@ -28,8 +105,6 @@ class AnomalyEngine:
             baseline: Baseline statistics dictionary
             machine_type: Type of machine ("sumitomo" or "haas") - affects threshold sensitivity
         """
-        self.baseline = baseline
-        self.speed = baseline['speed']
         self.machine_type = machine_type
         
         # Machine-specific alert thresholds
@@ -59,6 +134,52 @@ class AnomalyEngine:
             # Absolute safety limits (hard cutoffs)
             self.temp_min_critical = 10.0  # Critical low
             self.temp_max_critical = 40.0  # Critical high
+        
+        # Temperature health slopes, precomputed for the same reason
+        self._inv_temp_slope_band = 1.0 / (self.temp_slope_danger - self.temp_slope_caution)
+        self._inv_temp_slope_danger = 1.0 / self.temp_slope_danger
+        
+        self._vib_mag_buf = np.empty(0, dtype=np.float32)  # scratch for the magnitude, grown on demand
+        self._window = WindowView()  # rebound by _get_window() every frame
+        
+        # Health scores are clamped to [0, 100] and every state/message
+        # threshold is a whole number, so int(health) indexes a table that
+        # gives the same answer as the comparison ladders
+        self._state_lut = tuple(get_state_from_health(float(i)) for i in range(101))
+        self._overall_message_lut = tuple(self._overall_message(float(i)) for i in range(101))
+        
+        # Last generated messages and the state/values they were built from
+        self._last_message_key = None
+        self._last_messages: Tuple[str, ...] = ()
+        
+        self.set_baseline(baseline)
+    
+    def set_baseline(self, baseline: Dict[str, Any]):
+        """
+        Switch the engine to a new baseline (e.g. on a speed change).
+        
+        The machine thresholds, lookup tables and scratch buffers are kept;
+        only the baseline-derived values and the cached result are reset.
+        
+        Args:
+            baseline: Baseline statistics dictionary
+        """
+        self.baseline = baseline
+        self.speed = baseline['speed']
+        
+        # The baseline is fixed until the next set_baseline(), so precompute
+        # what the per-frame z-scores need (0.0 reciprocals disable the score,
+        # as compute_z_score does for a zero std)
+        self._baseline_vib_mean = baseline['vib_mean']
+        self._inv_vib_std = 1.0 / baseline['vib_std'] if baseline['vib_std'] != 0 else 0.0
+        self._inv_vib_max = 1.0 / baseline['vib_max'] if baseline['vib_max'] > 0 else 0.0
+        
+        # Result dicts are built once with every key and then updated in
+        # place; analyze() hands out a C-level copy instead of inserting
+        # ~24 keys into a fresh dict each frame
+        self._empty = self._build_empty_result()
+        self._result = dict(self._empty)
+        self._last_signature = None  # window the current self._result was computed from
     
     def analyze(self, data: Dict[str, np.ndarray], window_duration: float = 2.0) -> Dict[str, Any]:
         """
@@ -76,101 +197,228 @@ class AnomalyEngine:
             return self._empty_result()
         
         # Get recent window
-        window_data = self._get_window(data, window_duration)
+        window = self._get_window(data, window_duration)
         
-        if len(window_data['timestamps']) < 2:
+        if len(window.timestamps) < 2:
             return self._empty_result()
         
-        # Compute vibration magnitude
-        vib_mag = compute_vibration_magnitude_array(
-            window_data['ax'],
-            window_data['ay'],
-            window_data['az']
-        )
+        # Sensor streams only append, so a window with the same length and
+        # the same first/last timestamps holds the same samples: when no new
+        # sample arrived since the last call, the last result still applies
+        timestamps = window.timestamps
+        signature = (len(timestamps), float(timestamps[0]), float(timestamps[-1]), window_duration)
+        if signature == self._last_signature:
+            return self._copy_result()
         
         # Vibration analysis
-        vib_metrics = self._analyze_vibration(vib_mag)
+        vib_metrics = self._analyze_vibration(
+            window.ax,
+            window.ay,
+            window.az
+        )
         
         # Temperature analysis
         temp_metrics = self._analyze_temperature(
-            window_data['temp'],
-            window_data['timestamps']
+            window.temp,
+            window.timestamps
         )
         
-        # Overall health
-        overall_health = min(vib_metrics['health_score'], temp_metrics['health_score'])
-        overall_state, overall_color = get_state_from_health(overall_health)
+        # Overall health is that of the worse channel; the state lookup is
+        # monotonic in health, so that channel's state/color already applies
+        # (a 'Sensor Off' temperature scores 100 and never wins over vibration)
+        if vib_metrics.health_score <= temp_metrics.health_score:
+            overall_health = vib_metrics.health_score
+            overall_state, overall_color = vib_metrics.state, vib_metrics.color
+        else:
+            overall_health = temp_metrics.health_score
+            overall_state, overall_color = temp_metrics.state, temp_metrics.color
         
         # Generate diagnostic messages
-        messages = self._generate_messages(vib_metrics, temp_metrics)
-        
-        # Build result
-        result = {
-            # Vibration metrics
-            'vib_mean': vib_metrics['mean'],
-            'vib_std': vib_metrics['std'],
-            'vib_max': vib_metrics['max'],
-            'vib_z_score': vib_metrics['z_score'],
-            'vib_health_score': vib_metrics['health_score'],
-            'vib_state': vib_metrics['state'],
-            'vib_color': vib_metrics['color'],
-            
-            # Temperature metrics
-            'temp_mean': temp_metrics['mean'],
-            'temp_std': temp_metrics['std'],
-            'temp_slope': temp_metrics['slope'],
-            'temp_z_score': temp_metrics['z_score'],
-            'temp_z_score_mean': temp_metrics.get('z_score_mean', 0.0),
-            'temp_z_score_rate': temp_metrics.get('z_score_rate', 0.0),
-            'temp_health_score': temp_metrics['health_score'],
-            'temp_state': temp_metrics['state'],
-            'temp_color': temp_metrics['color'],
-            
-            # Overall
-            'overall_health_score': overall_health,
-            'overall_state': overall_state,
-            'overall_color': overall_color,
-            
-            # Messages
-            'messages': messages,
-            'primary_message': messages[0] if messages else "No data",
-            
-            # Metadata
-            'sample_count': len(window_data['timestamps']),
-            'window_duration': window_duration,
-            'baseline_speed': self.speed
-        }
+        messages = self._generate_messages(vib_metrics, temp_metrics, overall_health)
+        
+        # Fill the preallocated result in place
+        result = self._result
+        
+        # Vibration metrics
+        result['vib_mean'] = vib_metrics.mean
+        result['vib_std'] = vib_metrics.std
+        result['vib_max'] = vib_metrics.max
+        result['vib_z_score'] = vib_metrics.z_score
+        result['vib_health_score'] = vib_metrics.health_score
+        result['vib_state'] = vib_metrics.state
+        result['vib_color'] = vib_metrics.color
+        
+        # Temperature metrics
+        result['temp_mean'] = temp_metrics.mean
+        result['temp_std'] = temp_metrics.std
+        result['temp_slope'] = temp_metrics.slope
+        result['temp_z_score'] = temp_metrics.z_score
+        result['temp_z_score_mean'] = temp_metrics.z_score_mean
+        result['temp_z_score_rate'] = temp_metrics.z_score_rate
+        result['temp_health_score'] = temp_metrics.health_score
+        result['temp_state'] = temp_metrics.state
+        result['temp_color'] = temp_metrics.color
+        
+        # Overall
+        result['overall_health_score'] = overall_health
+        result['overall_state'] = overall_state
+        result['overall_color'] = overall_color
+        
+        # Messages
+        result['messages'] = messages
+        result['primary_message'] = messages[0] if messages else "No data"
+        
+        # Metadata
+        result['sample_count'] = len(window.timestamps)
+        result['window_duration'] = window_duration
+        self._last_signature = signature
+        
+        return self._copy_result()
+    
+    def _copy_result(self) -> Dict[str, Any]:
+        """
+        Copy the preallocated result for returning to a caller.
+        
+        The messages are kept as the cached tuple from _generate_messages
+        and handed out as a new list, so a caller editing its result cannot
+        change the result or the messages of later frames.
         
+        Returns:
+            Shallow copy of the result with its own messages list
+        """
+        result = self._result.copy()
+        result['messages'] = list(result['messages'])
         return result
     
-    def _analyze_vibration(self, vib_mag: np.ndarray) -> Dict[str, Any]:
+    def analyze_batch(self, data: Dict[str, np.ndarray], window_starts: np.ndarray,
+                      window_ends: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compute health metrics for many windows at once (offline backtesting).
+        
+        Each window is gathered into one row of padded 2-D arrays, so every
+        statistic is a single vectorized NumPy call across the whole batch
+        instead of one analyze() call per frame. Windows may overlap.
+        Messages and states are not generated; look states up from the
+        health scores, or call analyze() for the frames that need text.
+        
+        Args:
+            data: Dictionary with 'timestamps', 'ax', 'ay', 'az', 'temp' arrays
+            window_starts: Index of the first sample of each window
+            window_ends: Index one past the last sample of each window
+            
+        Returns:
+            Dictionary of arrays (one value per window) with vib_mean, vib_std,
+            vib_max, vib_z_score, vib_health_score, temp_mean, temp_std,
+            temp_slope, temp_health_score, overall_health_score, sample_count
+        """
+        starts = np.asarray(window_starts, dtype=np.intp)
+        counts = np.asarray(window_ends, dtype=np.intp) - starts
+        if len(data['timestamps']) == 0:
+            # Nothing to gather from: every window is empty
+            data = {key: np.zeros(1) for key in ('timestamps', 'ax', 'ay', 'az', 'temp')}
+            counts = np.zeros_like(counts)
+        last = len(data['timestamps']) - 1
+        width = int(counts.max()) if counts.size else 0
+        
+        # Row b holds samples starts[b] .. starts[b] + counts[b] - 1; padding
+        # slots repeat the first sample and are masked out of every sum
+        first = np.clip(starts, 0, last)
+        offsets = np.arange(width)
+        valid = offsets < counts[:, None]
+        index = np.where(valid, starts[:, None] + offsets, first[:, None])
+        np.clip(index, 0, last, out=index)
+        n = np.maximum(counts, 1)
+        
+        def gather(key):
+            return np.asarray(data[key])[index]
+        
+        # Vibration: same statistics and z-scores as _analyze_vibration
+        ax, ay, az = gather('ax'), gather('ay'), gather('az')
+        mag = np.sqrt(ax * ax + ay * ay + az * az)
+        vib_mean = np.where(valid, mag, 0.0).sum(axis=1) / n
+        dev = np.where(valid, mag - vib_mean[:, None], 0.0)
+        vib_std = np.sqrt((dev * dev).sum(axis=1) / n)
+        vib_max = np.where(valid, mag, -np.inf).max(axis=1, initial=-np.inf)
+        
+        z_score_mean = (vib_mean - self._baseline_vib_mean) * self._inv_vib_std
+        z_score_max = (vib_max * self._inv_vib_max - 1.0) * 5.0 if self._inv_vib_max > 0 else 0.0
+        vib_z = np.maximum(np.abs(z_score_mean), np.abs(z_score_max))
+        vib_health = health_score_from_z_array(vib_z, self.vib_z_caution, self.vib_z_danger)
+        
+        # Temperature: mean/std/slope from centered values, as in compute_temperature_stats
+        temps = gather('temp')
+        temp_mean = np.where(valid, temps, 0.0).sum(axis=1) / n
+        dtemp = np.where(valid, temps - temp_mean[:, None], 0.0)
+        temp_std = np.sqrt((dtemp * dtemp).sum(axis=1) / n)
+        
+        t = gather('timestamps') - np.asarray(data['timestamps'])[first][:, None]
+        t = np.where(valid, t, 0.0)
+        t -= (t.sum(axis=1) / n)[:, None]
+        t *= valid
+        stt = (t * t).sum(axis=1)
+        temp_slope = np.divide((t * dtemp).sum(axis=1), stt, out=np.zeros_like(stt), where=stt > 0)
+        
+        # Same slope thresholds and absolute limits as _analyze_temperature
+        slope_abs = np.abs(temp_slope)
+        temp_health = (100.0
+                       - np.clip((slope_abs - self.temp_slope_caution) * self._inv_temp_slope_band, 0.0, 1.0) * 50.0
+                       - np.clip((slope_abs - self.temp_slope_danger) * self._inv_temp_slope_danger, 0.0, 1.0) * 50.0)
+        temp_health *= (temp_mean > self.temp_min_critical) & (temp_mean < self.temp_max_critical)
+        
+        # Disconnected sensor reads ~0 °C: reported as zeros and ignored
+        sensor_off = temp_mean < 1.0
+        temp_mean[sensor_off] = 0.0
+        temp_std[sensor_off] = 0.0
+        temp_slope[sensor_off] = 0.0
+        temp_health[sensor_off] = 100.0
+        
+        # Windows too short to analyze match _empty_result()
+        empty = counts < 2
+        for values in (vib_mean, vib_std, vib_max, vib_z, temp_mean, temp_std, temp_slope):
+            values[empty] = 0.0
+        vib_health[empty] = 100.0
+        temp_health[empty] = 100.0
+        
+        return {
+            'vib_mean': vib_mean,
+            'vib_std': vib_std,
+            'vib_max': vib_max,
+            'vib_z_score': vib_z,
+            'vib_health_score': vib_health,
+            'temp_mean': temp_mean,
+            'temp_std': temp_std,
+            'temp_slope': temp_slope,
+            'temp_health_score': temp_health,
+            'overall_health_score': np.minimum(vib_health, temp_health),
+            'sample_count': np.where(empty, 0, counts)
+        }
+    
+    def _analyze_vibration(self, ax: np.ndarray, ay: np.ndarray, az: np.ndarray) -> VibrationMetrics:
         """
         Analyze vibration data.
         
         Args:
-            vib_mag: Array of vibration magnitudes
+            ax, ay, az: Arrays of acceleration values in g
             
         Returns:
-            Dictionary with vibration metrics
+            VibrationMetrics tuple
         """
-        # Compute statistics
-        vib_mean = np.mean(vib_mag)
-        vib_std = np.std(vib_mag)
-        vib_max = np.max(vib_mag)
+        # Compute magnitude statistics in one fused helper, writing the
+        # magnitude into a buffer reused across frames
+        n = len(ax)
+        if len(self._vib_mag_buf) < n:
+            self._vib_mag_buf = np.empty(max(n, 2 * len(self._vib_mag_buf)), dtype=np.float32)
+        vib_mean, vib_std, vib_max = compute_vibration_stats(ax, ay, az, out=self._vib_mag_buf[:n])
         
         # Compute z-score (deviation from baseline)
         # We check both Mean and Max deviation
-        z_score_mean = compute_z_score(
-            vib_mean,
-            self.baseline['vib_mean'],
-            self.baseline['vib_std']
-        )
+        z_score_mean = (vib_mean - self._baseline_vib_mean) * self._inv_vib_std
         
         # Use Max for impact detection (hitting the motor)
         # Since we don't have vib_max_std, we use vib_std as a proxy or check against vib_max directly
         # A sudden impact increases MAX much more than MEAN
-        if self.baseline['vib_max'] > 0:
-            max_ratio = vib_max / self.baseline['vib_max']
+        if self._inv_vib_max > 0:
+            max_ratio = vib_max * self._inv_vib_max
             # If current max is 2x baseline max, that's a huge impact
             # Convert ratio to pseudo z-score: (ratio - 1) * 3
             z_score_max = (max_ratio - 1.0) * 5.0
@@ -184,19 +432,11 @@ class AnomalyEngine:
         health_score = health_score_from_z(z_score, self.vib_z_caution, self.vib_z_danger)
         
         # Get state
-        state, color = get_state_from_health(health_score)
+        state, color = self._state_lut[int(health_score)]
         
-        return {
-            'mean': vib_mean,
-            'std': vib_std,
-            'max': vib_max,
-            'z_score': z_score,
-            'health_score': health_score,
-            'state': state,
-            'color': color
-        }
+        return VibrationMetrics(vib_mean, vib_std, vib_max, z_score, health_score, state, color)
     
-    def _analyze_temperature(self, temps: np.ndarray, timestamps: np.ndarray) -> Dict[str, Any]:
+    def _analyze_temperature(self, temps: np.ndarray, timestamps: np.ndarray) -> TemperatureMetrics:
         """
         Analyze temperature data using rate of change (slope) detection only.
         No baseline comparison - temperature varies with environment.
@@ -207,152 +447,146 @@ class AnomalyEngine:
             timestamps: Array of timestamps
             
         Returns:
-            Dictionary with temperature metrics
+            TemperatureMetrics tuple
         """
-        # Compute statistics
-        temp_mean = np.mean(temps)
+        # Compute mean, std and slope (rate of change via linear regression)
+        # from one set of deviations
+        temp_mean, temp_std, temp_slope = compute_temperature_stats(temps, timestamps)
         
         # Special handling for disconnected sensor (0 value)
         if temp_mean < 1.0:
-            return {
-                'mean': 0.0,
-                'std': 0.0,
-                'slope': 0.0,
-                'z_score': 0.0,
-                'z_score_mean': 0.0,
-                'z_score_rate': 0.0,
-                'health_score': 100.0,  # Consider healthy (ignored)
-                'state': 'Sensor Off',
-                'color': '#8E8E93'  # Grey
-            }
+            return SENSOR_OFF_TEMPERATURE
 
-        temp_std = np.std(temps)
-        
-        # Compute temperature slope (rate of change via linear regression)
-        temp_slope = compute_temperature_slope(temps, timestamps)
         temp_slope_abs = abs(temp_slope)
         
         # --- Rate of Change Analysis (No Baseline) ---
         # Detect rapid temperature changes regardless of absolute value
         # This catches thermal runaway, sudden cooling, etc.
         
-        health_score = 100.0
         z_score = 0.0  # Not used for temperature, kept for compatibility
         
-        # Check rate of change
-        if temp_slope_abs <= self.temp_slope_caution:
-            # Normal rate of change
-            health_score = 100.0
-        elif temp_slope_abs <= self.temp_slope_danger:
-            # Caution: Temperature changing rapidly
-            # Linear drop from 100 to 50 based on how fast
-            progress = (temp_slope_abs - self.temp_slope_caution) / (self.temp_slope_danger - self.temp_slope_caution)
-            health_score = 100.0 - progress * 50.0
-        else:
-            # Danger: Temperature changing very rapidly
-            # Linear drop from 50 to 0
-            excess = temp_slope_abs - self.temp_slope_danger
-            progress = min(1.0, excess / self.temp_slope_danger)
-            health_score = 50.0 - progress * 50.0
+        # Rate of change as clamp arithmetic instead of a branch ladder:
+        # 100 up to the caution slope, a linear drop to 50 at the danger
+        # slope, then a linear drop to 0 at twice the danger slope
+        caution_progress = min(1.0, max(0.0, (temp_slope_abs - self.temp_slope_caution) * self._inv_temp_slope_band))
+        danger_progress = min(1.0, max(0.0, (temp_slope_abs - self.temp_slope_danger) * self._inv_temp_slope_danger))
+        health_score = 100.0 - caution_progress * 50.0 - danger_progress * 50.0
         
         # --- Absolute Safety Limits (Hard Cutoffs) ---
-        # Override health score if temperature exceeds critical absolute limits
-        if temp_mean >= self.temp_max_critical:
-            # Critical high temperature - immediate danger
-            health_score = 0.0
-        elif temp_mean <= self.temp_min_critical:
-            # Critical low temperature - immediate danger
-            health_score = 0.0
-        
-        # Ensure bounds
-        health_score = max(0.0, min(100.0, health_score))
+        # Outside the critical absolute limits the score is zeroed
+        health_score *= self.temp_min_critical < temp_mean < self.temp_max_critical
         
         # Get state
-        state, color = get_state_from_health(health_score)
+        state, color = self._state_lut[int(health_score)]
         
-        return {
-            'mean': temp_mean,
-            'std': temp_std,
-            'slope': temp_slope,
-            'z_score': z_score,  # Not used, kept for compatibility
-            'z_score_mean': 0.0,  # Not used
-            'z_score_rate': 0.0,  # Not used
-            'health_score': health_score,
-            'state': state,
-            'color': color
-        }
+        return TemperatureMetrics(temp_mean, temp_std, temp_slope, z_score, 0.0, 0.0,
+                                  health_score, state, color)
     
-    def _generate_messages(self, vib_metrics: Dict, temp_metrics: Dict) -> List[str]:
+    def _generate_messages(self, vib_metrics: VibrationMetrics, temp_metrics: TemperatureMetrics,
+                           overall_health: float) -> Tuple[str, ...]:
         """
         Generate human-readable diagnostic messages.
         
         Args:
             vib_metrics: Vibration analysis results
             temp_metrics: Temperature analysis results
+            overall_health: Overall health score (the lower of the two)
             
         Returns:
-            List of diagnostic messages
+            Tuple of diagnostic messages (shared with later calls, not copied)
+        """
+        vib_code = self._classify_vibration(vib_metrics.z_score)
+        
+        # Temperature messages (Rate of change + Absolute limits)
+        temp_mean = temp_metrics.mean
+        temp_slope = temp_metrics.slope
+        temp_code = self._classify_temperature(temp_mean, temp_slope)
+        
+        # Overall health message
+        overall_message = self._overall_message_lut[int(overall_health)]
+        
+        # A steady motor produces the same text frame after frame: reuse the
+        # previous list unless a state or a displayed (rounded) value changed.
+        # The states are part of the key, so critical transitions always rebuild
+        key = (vib_code, temp_code, overall_message,
+               round(temp_mean, 1), round(temp_slope, 3), temp_slope < 0)
+        if key != self._last_message_key:
+            self._last_message_key = key
+            self._last_messages = (
+                VIBRATION_MESSAGES[vib_code],
+                TEMPERATURE_MESSAGES[temp_code].format(mean=temp_mean, slope=temp_slope),
+                overall_message
+            )
+        
+        return self._last_messages
+    
+    def _classify_vibration(self, vib_z: float) -> str:
         """
-        messages = []
+        Classify a vibration z-score for message selection.
         
-        # Vibration messages
-        vib_z = vib_metrics['z_score']
+        Args:
+            vib_z: Vibration z-score
+            
+        Returns:
+            'normal', 'elevated', 'low', 'high' or 'very_low'
+        """
         if abs(vib_z) <= self.vib_z_caution:
-            messages.append("✅ Vibration within normal range")
+            return 'normal'
         elif abs(vib_z) <= self.vib_z_danger:
-            if vib_z > 0:
-                messages.append("⚠️ Vibration elevated above normal")
-            else:
-                messages.append("⚠️ Vibration unusually low")
+            return 'elevated' if vib_z > 0 else 'low'
         else:
-            if vib_z > 0:
-                messages.append("🚨 High vibration detected!")
-            else:
-                messages.append("🚨 Abnormally low vibration!")
+            return 'high' if vib_z > 0 else 'very_low'
+    
+    def _classify_temperature(self, temp_mean: float, temp_slope: float) -> str:
+        """
+        Classify temperature level and rate of change for message selection.
         
-        # Temperature messages (Rate of change + Absolute limits)
-        temp_mean = temp_metrics['mean']
-        temp_slope = temp_metrics.get('slope', 0.0)
+        Args:
+            temp_mean: Mean temperature in °C
+            temp_slope: Temperature slope in °C/s
+            
+        Returns:
+            'off', 'critical_high', 'critical_low', 'stable', 'rising',
+            'dropping', 'rising_fast' or 'dropping_fast'
+        """
         temp_slope_abs = abs(temp_slope)
         
         if temp_mean < 1.0:
-             messages.append("⚪ Temperature sensor disconnected")
+            return 'off'
         elif temp_mean >= self.temp_max_critical:
-            messages.append(f"🚨 Temperature CRITICAL HIGH ({temp_mean:.1f}°C) - Absolute limit exceeded!")
+            return 'critical_high'
         elif temp_mean <= self.temp_min_critical:
-            messages.append(f"🚨 Temperature CRITICAL LOW ({temp_mean:.1f}°C) - Absolute limit exceeded!")
+            return 'critical_low'
+        elif temp_slope_abs <= self.temp_slope_caution:
+            return 'stable'
+        elif temp_slope_abs <= self.temp_slope_danger:
+            return 'rising' if temp_slope > 0 else 'dropping'
         else:
-            # Rate of change analysis messages
-            if temp_slope_abs <= self.temp_slope_caution:
-                messages.append(f"✅ Temperature stable ({temp_mean:.1f}°C, {temp_slope:+.3f}°C/s)")
-            elif temp_slope_abs <= self.temp_slope_danger:
-                if temp_slope > 0:
-                    messages.append(f"⚠️ Temperature rising rapidly ({temp_mean:.1f}°C, {temp_slope:+.3f}°C/s)")
-                else:
-                    messages.append(f"⚠️ Temperature dropping rapidly ({temp_mean:.1f}°C, {temp_slope:+.3f}°C/s)")
-            else:
-                if temp_slope > 0:
-                    messages.append(f"🚨 Temperature rising DANGEROUSLY FAST ({temp_mean:.1f}°C, {temp_slope:+.3f}°C/s)!")
-                else:
-                    messages.append(f"🚨 Temperature dropping DANGEROUSLY FAST ({temp_mean:.1f}°C, {temp_slope:+.3f}°C/s)!")
-        
-        # Overall health message
-        overall_health = min(vib_metrics['health_score'], temp_metrics['health_score'])
+            return 'rising_fast' if temp_slope > 0 else 'dropping_fast'
+    
+    @staticmethod
+    def _overall_message(overall_health: float) -> str:
+        """
+        Get the overall condition message for a health score.
         
+        Args:
+            overall_health: Overall health score (0-100)
+            
+        Returns:
+            Diagnostic message
+        """
         if overall_health >= 90:
-            messages.append("💚 Motor operating in excellent condition")
+            return "💚 Motor operating in excellent condition"
         elif overall_health >= 70:
-            messages.append("💚 Motor operating normally")
+            return "💚 Motor operating normally"
         elif overall_health >= 50:
-            messages.append("⚠️ Minor deviations detected - monitor closely")
+            return "⚠️ Minor deviations detected - monitor closely"
         elif overall_health >= 30:
-            messages.append("⚠️ Caution - significant deviations from baseline")
+            return "⚠️ Caution - significant deviations from baseline"
         else:
-            messages.append("🚨 Critical - immediate inspection recommended!")
-        
-        return messages
+            return "🚨 Critical - immediate inspection recommended!"
     
-    def _get_window(self, data: Dict[str, np.ndarray], duration: float) -> Dict[str, np.ndarray]:
+    def _get_window(self, data: Dict[str, np.ndarray], duration: float) -> WindowView:
         """
         Extract most recent window from data.
         
@@ -361,26 +595,40 @@ class AnomalyEngine:
             duration: Window duration in seconds
             
         Returns:
-            Windowed data dictionary
+            The engine's WindowView, rebound to the new window
         """
-        if len(data['timestamps']) == 0:
-            return data
-        
-        cutoff = data['timestamps'][-1] - duration
-        mask = data['timestamps'] >= cutoff
-        
-        return {
-            'timestamps': data['timestamps'][mask],
-            'ax': data['ax'][mask],
-            'ay': data['ay'][mask],
-            'az': data['az'][mask],
-            'temp': data['temp'][mask]
-        }
+        window = self._window
+        timestamps = data['timestamps']
+        
+        # Timestamps are monotonic, so a binary search finds the window start
+        # and plain slices return views instead of masked copies
+        start = np.searchsorted(timestamps, timestamps[-1] - duration, side='left') if len(timestamps) else 0
+        
+        # Sensor channels are analyzed in float32 (the Arduino sends 3-4
+        # significant digits), halving the memory traffic of every pass;
+        # astype is a no-op when the source already stores float32.
+        # Timestamps stay float64: epoch seconds need its precision
+        window.timestamps = timestamps[start:]
+        window.ax = data['ax'][start:].astype(np.float32, copy=False)
+        window.ay = data['ay'][start:].astype(np.float32, copy=False)
+        window.az = data['az'][start:].astype(np.float32, copy=False)
+        window.temp = data['temp'][start:].astype(np.float32, copy=False)
+        
+        return window
     
     def _empty_result(self) -> Dict[str, Any]:
         """
         Return empty result when no data is available.
         
+        Returns:
+            Dictionary with default values
+        """
+        return self._empty.copy()
+    
+    def _build_empty_result(self) -> Dict[str, Any]:
+        """
+        Build the default result (also the key layout of every result).
+        
         Returns:
             Dictionary with default values
         """
@@ -16,16 +16,40 @@ from data_replay import DataReplay
 from anomaly_engine import AnomalyEngine
 from utils import (
     compute_vibration_magnitude_array,
-    compute_rms,
-    compute_coefficient_of_variation,
-    compute_percentiles,
-    compute_peak_to_peak,
-    compute_skewness,
-    compute_kurtosis
+    compute_all_vib_stats,
+    min_max_moments
 )
 import ui_components as ui
 
 
+# Live dashboard refresh intervals (seconds)
+REFRESH_INTERVAL = 0.1  # 10 FPS
+VECTOR_3D_REFRESH_INTERVAL = 0.5  # 2 FPS for the WebGL 3D vector scene
+DIAGNOSTICS_REFRESH_INTERVAL = 1.0  # Reader statistics (counters, packet rate)
+
+
+# Metric card help text (static, so not rebuilt on every refresh)
+METRIC_HELP = {
+    'vib_mean': 'Average vibration magnitude. Higher values may indicate bearing wear, imbalance, or misalignment.',
+    'vib_rms': 'Root Mean Square - measures overall vibration energy. More sensitive to peaks than mean.',
+    'vib_std': 'Standard deviation - indicates vibration consistency. High values suggest irregular motion.',
+    'vib_max': 'Maximum vibration spike detected. Sudden increases may indicate mechanical shock or failure.',
+    'vib_peak_to_peak': 'Range of vibration (max - min). Indicates motion amplitude and severity of oscillation.',
+    'temp_mean': 'Average motor temperature. Elevated temps may indicate friction, poor lubrication, or overload.',
+    'temp_range': 'Temperature variation in current window. High fluctuations may indicate unstable operation.',
+    'temp_slope': 'Rate of temperature change. Rapid increases suggest developing problems or thermal runaway.',
+    'temp_cv': 'Coefficient of variation - temperature stability metric. Lower is better for steady operation.',
+    'vib_z_score': 'Deviation from baseline in standard deviations. >2σ = caution, >3σ = danger.',
+    'vib_cv': 'Coefficient of variation - vibration consistency. Lower values indicate steady operation.',
+    'vib_skewness': 'Distribution asymmetry. Near 0 = symmetric, positive = right tail, negative = left tail.',
+    'vib_kurtosis': 'Tail heaviness. 0 = normal, positive = heavy tails (more outliers), negative = light tails.',
+    'p25': '25th percentile - 25% of vibration readings are below this value.',
+    'p50': 'Median - middle value. More robust to outliers than mean.',
+    'p75': '75th percentile - 75% of vibration readings are below this value.',
+    'p95': '95th percentile - captures high vibration events while excluding extreme outliers.'
+}
+
+
 # Page configuration
 st.set_page_config(
     page_title="Motor Health Monitor",
@@ -48,6 +72,42 @@ def init_session_state():
         st.session_state.mode = "replay"  # 'serial' or 'replay'
         st.session_state.last_update = time.time()
         st.session_state.machine_type = "sumitomo"  # 'sumitomo' or 'haas'
+        st.session_state.vib_deviation_scale = 0.0
+        st.session_state.temp_deviation_scale = 0.0
+        st.session_state.distribution_frame = 0
+        st.session_state.distribution_signatures = [None] * 4
+
+
+@st.cache_data(show_spinner=False)
+def _load_baselines_cached(data_dir: str, machine_type: str) -> dict:
+    """
+    Parse the baseline CSVs for a machine once per process.
+    
+    Args:
+        data_dir: Base data directory
+        machine_type: Type of machine ("sumitomo" or "haas")
+        
+    Returns:
+        Dictionary mapping speed to baseline statistics
+    """
+    return BaselineLoader(data_dir, machine_type=machine_type).load_all_baselines()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_loader(data_dir: str, machine_type: str) -> BaselineLoader:
+    """
+    Get the baseline loader for a machine, shared by all sessions.
+    
+    Args:
+        data_dir: Base data directory
+        machine_type: Type of machine ("sumitomo" or "haas")
+        
+    Returns:
+        BaselineLoader with its baselines populated
+    """
+    loader = BaselineLoader(data_dir, machine_type=machine_type)
+    loader.baselines = _load_baselines_cached(data_dir, machine_type)
+    return loader
 
 
 def load_baselines(machine_type: str = None):
@@ -65,8 +125,8 @@ def load_baselines(machine_type: str = None):
         with st.spinner(f"Loading baseline profiles for {machine_type}..."):
             try:
                 data_dir = Path(__file__).parent / "data"
-                loader = BaselineLoader(str(data_dir), machine_type=machine_type)
-                baselines = loader.load_all_baselines()
+                loader = _get_loader(str(data_dir), machine_type)
+                baselines = loader.baselines
                 
                 st.session_state.baseline_loader = loader
                 st.session_state.baselines = baselines
@@ -139,8 +199,17 @@ def update_anomaly_engine(speed: str):
         baseline = st.session_state.baselines[speed]
         # Pass machine_type to AnomalyEngine for machine-specific thresholds
         machine_type = st.session_state.get('machine_type', 'sumitomo')
-        st.session_state.anomaly_engine = AnomalyEngine(baseline, machine_type=machine_type)
+        engine = st.session_state.anomaly_engine
+        if engine is not None and engine.machine_type == machine_type:
+            # Same machine: keep the engine (thresholds, tables, buffers), swap the baseline
+            engine.set_baseline(baseline)
+        else:
+            st.session_state.anomaly_engine = AnomalyEngine(baseline, machine_type=machine_type)
         st.session_state.current_speed = speed
+        
+        # Percent-deviation scales, so the dashboard multiplies instead of dividing
+        st.session_state.vib_deviation_scale = 100.0 / baseline['vib_mean'] if baseline['vib_mean'] > 0 else 0.0
+        st.session_state.temp_deviation_scale = 100.0 / baseline['temp_mean'] if baseline['temp_mean'] > 0 else 0.0
 
 
 def render_sidebar():
@@ -301,16 +370,7 @@ def render_sidebar():
         
         # System info
         st.markdown("### ℹ️ System Info")
-        if st.session_state.data_source:
-            stats = st.session_state.data_source.get_statistics()
-            
-            if st.session_state.mode == "replay":
-                st.metric("Packets Received", stats.get('packet_count', 0))
-                st.metric("Progress", f"{stats.get('progress', 0):.0f}%")
-            else:
-                st.metric("FPS", f"{stats.get('fps', 0):.1f}")
-                st.metric("Packets", stats.get('packet_count', 0))
-                st.metric("Errors", stats.get('error_count', 0))
+        _render_system_info()
         
         # Restart button
         if st.button("🔄 Restart", use_container_width=True):
@@ -320,6 +380,76 @@ def render_sidebar():
                     st.success("Restarted!")
 
 
+@st.fragment(run_every=DIAGNOSTICS_REFRESH_INTERVAL)
+def _render_system_info():
+    """Render the live sidebar metrics (reruns on its own at 1 FPS)."""
+    
+    if not st.session_state.data_source:
+        return
+    
+    stats = st.session_state.data_source.get_statistics()
+    
+    if st.session_state.mode == "replay":
+        st.metric("Packets Received", stats.get('packet_count', 0))
+        st.metric("Progress", f"{stats.get('progress', 0):.0f}%")
+    else:
+        st.metric("FPS", f"{stats.get('fps', 0):.1f}")
+        st.metric("Packets", stats.get('packet_count', 0))
+        st.metric("Errors", stats.get('error_count', 0))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _analyze_window(ts_last: float, n: int, data_tail: bytes, machine_type: str, speed: str,
+                    _engine: AnomalyEngine, _data: dict):
+    """
+    Run the anomaly analysis and vibration statistics for a data window.
+    
+    Only the leading arguments are hashed: the last timestamp, the sample
+    count and the tail of the samples identify the window, so reruns where
+    no new packets arrived skip the engine and the NumPy reductions.
+    
+    Args:
+        ts_last: Last timestamp in the window
+        n: Number of samples in the window
+        data_tail: Raw bytes of the last few samples
+        machine_type: Machine type of the active baseline
+        speed: Speed of the active baseline
+        _engine: Anomaly engine to analyze with (not hashed)
+        _data: Recent sensor data (not hashed)
+        
+    Returns:
+        Tuple of (analysis, vib_mag, vib_stats)
+    """
+    analysis = _engine.analyze(_data, window_duration=2.0)
+    # float32 magnitude halves the memory traffic of the statistics below
+    vib_mag = compute_vibration_magnitude_array(
+        _data['ax'], _data['ay'], _data['az'],
+        out=np.empty(len(_data['ax']), dtype=np.float32)
+    )
+    vib_stats = compute_all_vib_stats(vib_mag)
+    return analysis, vib_mag, vib_stats
+
+
+def _hist_edges(lo: float, hi: float, bins: int = 30) -> np.ndarray:
+    """
+    Get histogram bin edges spanning [lo, hi].
+    
+    Not cached: lo/hi follow the live window and change almost every frame,
+    and a 31-point linspace is cheaper than cache_data's hashing and copy.
+    
+    Args:
+        lo: Lowest value
+        hi: Highest value
+        bins: Number of bins
+        
+    Returns:
+        Array of bins + 1 edges
+    """
+    if hi <= lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
 def render_main_dashboard():
     """Render main dashboard content."""
     
@@ -338,6 +468,18 @@ def render_main_dashboard():
         f"Real-time preventive monitoring for {machine_name}"
     )
     
+    # Live sections refresh on their own; the sidebar and header stay mounted
+    _render_live_dashboard()
+    _render_diagnostics()
+    
+    # Icon Legend (static, so outside the refreshing fragments)
+    ui.render_icon_legend()
+
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def _render_live_dashboard():
+    """Render the live dashboard sections (reruns on its own at 10 FPS)."""
+    
     # Check if we have data source
     if st.session_state.data_source is None:
         st.info("👈 Please configure and start a data source from the sidebar")
@@ -346,13 +488,22 @@ def render_main_dashboard():
     # Get recent data
     data = st.session_state.data_source.get_recent_data(duration=10.0)
     
+    # Single empty-data exit: everything below can assume a non-empty window
     if len(data['timestamps']) == 0:
         st.info("⏳ Waiting for data...")
         return
     
-    # Analyze data
+    # Analyze data (cached per window, so idle reruns reuse the last results)
     if st.session_state.anomaly_engine:
-        analysis = st.session_state.anomaly_engine.analyze(data, window_duration=2.0)
+        analysis, vib_mag, vib_stats = _analyze_window(
+            float(data['timestamps'][-1]),
+            len(data['timestamps']),
+            data['az'][-8:].tobytes(),
+            st.session_state.machine_type,
+            st.session_state.current_speed,
+            _engine=st.session_state.anomaly_engine,
+            _data=data
+        )
     else:
         st.warning("⚠️ Anomaly engine not initialized")
         return
@@ -400,212 +551,72 @@ def render_main_dashboard():
     # Key Metrics - Organized in multiple rows with better spacing
     ui.render_section_title("Key Performance Indicators", "Real-time sensor metrics compared to baseline performance")
     
-    # Compute additional metrics
-    vib_mag = compute_vibration_magnitude_array(data['ax'], data['ay'], data['az'])
-    vib_std = np.std(vib_mag) if len(vib_mag) > 0 else 0
-    vib_range = np.max(vib_mag) - np.min(vib_mag) if len(vib_mag) > 0 else 0
+    # Additional metrics
+    vib_std = vib_stats['std']
     
     # Calculate deviation from baseline
-    vib_deviation = ((analysis['vib_mean'] - baseline['vib_mean']) / baseline['vib_mean']) * 100 if baseline['vib_mean'] > 0 else 0
-    temp_deviation = ((analysis['temp_mean'] - baseline['temp_mean']) / baseline['temp_mean']) * 100 if baseline['temp_mean'] > 0 else 0
+    vib_deviation = (analysis['vib_mean'] - baseline['vib_mean']) * st.session_state.vib_deviation_scale
+    temp_deviation = (analysis['temp_mean'] - baseline['temp_mean']) * st.session_state.temp_deviation_scale
     
     # Format trend indicators
     vib_trend = f"{'+' if vib_deviation >= 0 else ''}{vib_deviation:.1f}% vs baseline"
     temp_trend = f"{'+' if temp_deviation >= 0 else ''}{temp_deviation:.1f}% vs baseline"
     
     # Compute additional statistical metrics
-    vib_rms = compute_rms(vib_mag) if len(vib_mag) > 0 else 0
-    vib_cv = compute_coefficient_of_variation(vib_mag) if len(vib_mag) > 0 else 0
-    vib_peak_to_peak = compute_peak_to_peak(vib_mag) if len(vib_mag) > 0 else 0
-    vib_percentiles = compute_percentiles(vib_mag) if len(vib_mag) > 0 else {}
-    vib_min = np.min(vib_mag) if len(vib_mag) > 0 else 0
-    vib_skewness = compute_skewness(vib_mag) if len(vib_mag) > 0 else 0
-    vib_kurtosis = compute_kurtosis(vib_mag) if len(vib_mag) > 0 else 0
-    
-    temp_min = np.min(data['temp']) if len(data['temp']) > 0 else 0
-    temp_max = np.max(data['temp']) if len(data['temp']) > 0 else 0
+    vib_rms = vib_stats['rms']
+    vib_cv = vib_stats['cv']
+    vib_peak_to_peak = vib_stats['peak_to_peak']
+    vib_skewness = vib_stats['skewness']
+    vib_kurtosis = vib_stats['kurtosis']
+    
+    temp_min, temp_max, temp_avg, temp_std = min_max_moments(data['temp'])
     temp_range = temp_max - temp_min
-    temp_cv = compute_coefficient_of_variation(data['temp']) if len(data['temp']) > 0 else 0
+    temp_cv = (temp_std / temp_avg) * 100.0 if temp_avg != 0 else 0.0
     
-    # Row 1: Primary Vibration Metrics (5 metrics)
+    # Rows 1-3: vibration (5), temperature (4) and statistical indicators (4),
+    # rendered together as one element
     vib_primary = [
-        {
-            'label': 'Vibration Mean',
-            'value': f"{analysis['vib_mean']:.4f}",
-            'unit': 'g',
-            'trend': vib_trend,
-            'color': ui.THEME['chart_vibration'],
-            'help': 'Average vibration magnitude. Higher values may indicate bearing wear, imbalance, or misalignment.'
-        },
-        {
-            'label': 'Vibration RMS',
-            'value': f"{vib_rms:.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': 'Root Mean Square - measures overall vibration energy. More sensitive to peaks than mean.'
-        },
-        {
-            'label': 'Std Dev',
-            'value': f"{vib_std:.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': 'Standard deviation - indicates vibration consistency. High values suggest irregular motion.'
-        },
-        {
-            'label': 'Max',
-            'value': f"{analysis['vib_max']:.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': 'Maximum vibration spike detected. Sudden increases may indicate mechanical shock or failure.'
-        },
-        {
-            'label': 'Peak-to-Peak',
-            'value': f"{vib_peak_to_peak:.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': 'Range of vibration (max - min). Indicates motion amplitude and severity of oscillation.'
-        }
+        ('Vibration Mean', f"{analysis['vib_mean']:.4f}", 'g', vib_trend, ui.THEME['chart_vibration'], METRIC_HELP['vib_mean']),
+        ('Vibration RMS', f"{vib_rms:.4f}", 'g', None, None, METRIC_HELP['vib_rms']),
+        ('Std Dev', f"{vib_std:.4f}", 'g', None, None, METRIC_HELP['vib_std']),
+        ('Max', f"{analysis['vib_max']:.4f}", 'g', None, None, METRIC_HELP['vib_max']),
+        ('Peak-to-Peak', f"{vib_peak_to_peak:.4f}", 'g', None, None, METRIC_HELP['vib_peak_to_peak'])
     ]
-    ui.render_metric_row(vib_primary)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Row 2: Temperature Metrics (4 metrics)
     temp_metrics = [
-        {
-            'label': 'Temperature',
-            'value': f"{analysis['temp_mean']:.1f}",
-            'unit': '°C',
-            'trend': temp_trend,
-            'color': ui.THEME['chart_temperature'],
-            'help': 'Average motor temperature. Elevated temps may indicate friction, poor lubrication, or overload.'
-        },
-        {
-            'label': 'Temp. Range',
-            'value': f"{temp_range:.1f}",
-            'unit': '°C',
-            'trend': None,
-            'color': None,
-            'help': 'Temperature variation in current window. High fluctuations may indicate unstable operation.'
-        },
-        {
-            'label': 'Temp. Rate',
-            'value': f"{analysis['temp_slope']:.3f}",
-            'unit': '°C/s',
-            'trend': None,
-            'color': None,
-            'help': 'Rate of temperature change. Rapid increases suggest developing problems or thermal runaway.'
-        },
-        {
-            'label': 'CV (Temp)',
-            'value': f"{temp_cv:.2f}",
-            'unit': '%',
-            'trend': None,
-            'color': None,
-            'help': 'Coefficient of variation - temperature stability metric. Lower is better for steady operation.'
-        }
+        ('Temperature', f"{analysis['temp_mean']:.1f}", '°C', temp_trend, ui.THEME['chart_temperature'], METRIC_HELP['temp_mean']),
+        ('Temp. Range', f"{temp_range:.1f}", '°C', None, None, METRIC_HELP['temp_range']),
+        ('Temp. Rate', f"{analysis['temp_slope']:.3f}", '°C/s', None, None, METRIC_HELP['temp_slope']),
+        ('CV (Temp)', f"{temp_cv:.2f}", '%', None, None, METRIC_HELP['temp_cv'])
     ]
-    ui.render_metric_row(temp_metrics)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Row 3: Statistical Indicators (4 metrics)
     statistical_indicators = [
-        {
-            'label': 'Z-Score (Vib)',
-            'value': f"{abs(analysis['vib_z_score']):.2f}",
-            'unit': 'σ',
-            'trend': None,
-            'color': analysis['vib_color'] if abs(analysis['vib_z_score']) > 2 else None,
-            'help': 'Deviation from baseline in standard deviations. >2σ = caution, >3σ = danger.'
-        },
-        {
-            'label': 'CV (Vib)',
-            'value': f"{vib_cv:.2f}",
-            'unit': '%',
-            'trend': None,
-            'color': None,
-            'help': 'Coefficient of variation - vibration consistency. Lower values indicate steady operation.'
-        },
-        {
-            'label': 'Skewness',
-            'value': f"{vib_skewness:.3f}",
-            'unit': '',
-            'trend': None,
-            'color': None,
-            'help': 'Distribution asymmetry. Near 0 = symmetric, positive = right tail, negative = left tail.'
-        },
-        {
-            'label': 'Kurtosis',
-            'value': f"{vib_kurtosis:.3f}",
-            'unit': '',
-            'trend': None,
-            'color': None,
-            'help': 'Tail heaviness. 0 = normal, positive = heavy tails (more outliers), negative = light tails.'
-        }
+        ('Z-Score (Vib)', f"{abs(analysis['vib_z_score']):.2f}", 'σ', None, analysis['vib_color'] if abs(analysis['vib_z_score']) > 2 else None, METRIC_HELP['vib_z_score']),
+        ('CV (Vib)', f"{vib_cv:.2f}", '%', None, None, METRIC_HELP['vib_cv']),
+        ('Skewness', f"{vib_skewness:.3f}", '', None, None, METRIC_HELP['vib_skewness']),
+        ('Kurtosis', f"{vib_kurtosis:.3f}", '', None, None, METRIC_HELP['vib_kurtosis'])
     ]
-    ui.render_metric_row(statistical_indicators)
+    ui.render_metric_rows([vib_primary, temp_metrics, statistical_indicators])
     
     # Additional Statistical Metrics - Percentiles
     ui.render_divider()
     ui.render_section_title("Distribution Percentiles", "Vibration magnitude distribution at key percentile thresholds")
     
     percentile_metrics = [
-        {
-            'label': 'P25',
-            'value': f"{vib_percentiles.get('p25', 0):.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': '25th percentile - 25% of vibration readings are below this value.'
-        },
-        {
-            'label': 'P50 (Median)',
-            'value': f"{vib_percentiles.get('p50', 0):.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': 'Median - middle value. More robust to outliers than mean.'
-        },
-        {
-            'label': 'P75',
-            'value': f"{vib_percentiles.get('p75', 0):.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': '75th percentile - 75% of vibration readings are below this value.'
-        },
-        {
-            'label': 'P95',
-            'value': f"{vib_percentiles.get('p95', 0):.4f}",
-            'unit': 'g',
-            'trend': None,
-            'color': None,
-            'help': '95th percentile - captures high vibration events while excluding extreme outliers.'
-        }
+        ('P25', f"{vib_stats['p25']:.4f}", 'g', None, None, METRIC_HELP['p25']),
+        ('P50 (Median)', f"{vib_stats['p50']:.4f}", 'g', None, None, METRIC_HELP['p50']),
+        ('P75', f"{vib_stats['p75']:.4f}", 'g', None, None, METRIC_HELP['p75']),
+        ('P95', f"{vib_stats['p95']:.4f}", 'g', None, None, METRIC_HELP['p95'])
     ]
-    
-    ui.render_metric_row(percentile_metrics)
+    ui.render_metric_rows([percentile_metrics])
     
     ui.render_divider()
     
     # Real-Time Plots Section
     ui.render_section_title("Real-Time Sensor Data", "Live trends showing the last 10 seconds of motor operation")
     
-    # Convert timestamps to relative seconds (time ago)
-    if len(data['timestamps']) > 0:
-        time_relative = data['timestamps'][-1] - data['timestamps']
-        time_relative = time_relative[::-1]  # Reverse for "seconds ago"
-        vib_mag_plot = vib_mag[::-1]
-        temp_plot = data['temp'][::-1]
-    else:
-        time_relative = np.array([])
-        vib_mag_plot = np.array([])
-        temp_plot = np.array([])
+    # Seconds ago, computed in place by the data source; the traces are
+    # plotted in acquisition order (a line through the same points, so no
+    # reversed copies are needed)
+    time_relative = st.session_state.data_source.get_relative_timestamps(data['timestamps'])
     
     # Two column layout for plots
     col1, col2 = st.columns(2)
@@ -613,7 +624,7 @@ def render_main_dashboard():
     with col1:
         ui.render_time_series_plot(
             time_relative,
-            vib_mag_plot,
+            vib_mag,
             "Vibration Magnitude",
             "Magnitude (g)",
             color=ui.THEME['chart_vibration'],
@@ -627,7 +638,7 @@ def render_main_dashboard():
     with col2:
         ui.render_time_series_plot(
             time_relative,
-            temp_plot,
+            data['temp'],
             "Temperature Trend",
             "Temperature (°C)",
             color=ui.THEME['chart_temperature'],
@@ -645,7 +656,8 @@ def render_main_dashboard():
             data['ax'],
             data['ay'],
             data['az'],
-            color=ui.THEME['chart_vibration']
+            color=ui.THEME['chart_vibration'],
+            min_refresh=VECTOR_3D_REFRESH_INTERVAL
         )
     
     with col2:
@@ -653,41 +665,54 @@ def render_main_dashboard():
         axis_metrics = [
             {
                 'label': 'X-Axis',
-                'value': f"{data['ax'][-1]:.4f}" if len(data['ax']) > 0 else "0.0000",
+                'value': f"{data['ax'][-1]:.4f}",
                 'unit': 'g',
                 'trend': None,
                 'color': ui.THEME['chart_vibration']
             },
             {
                 'label': 'Y-Axis',
-                'value': f"{data['ay'][-1]:.4f}" if len(data['ay']) > 0 else "0.0000",
+                'value': f"{data['ay'][-1]:.4f}",
                 'unit': 'g',
                 'trend': None,
                 'color': ui.THEME['chart_temperature']
             },
             {
                 'label': 'Z-Axis',
-                'value': f"{data['az'][-1]:.4f}" if len(data['az']) > 0 else "0.0000",
+                'value': f"{data['az'][-1]:.4f}",
                 'unit': 'g',
                 'trend': None,
                 'color': ui.THEME['accent_secondary']
             }
         ]
         
-        for metric in axis_metrics:
-            card_html = ui.render_metric_card(
+        # One markdown element for the stacked cards (as render_metric_rows)
+        cards_html = "<br>".join(
+            ui.render_metric_card(
                 metric['label'],
                 metric['value'],
                 metric['unit'],
                 metric.get('trend'),
                 metric.get('color')
             )
-            st.markdown(card_html, unsafe_allow_html=True)
-            st.markdown("<br>", unsafe_allow_html=True)
+            for metric in axis_metrics
+        )
+        st.markdown(cards_html, unsafe_allow_html=True)
     
     ui.render_divider()
     
-    # Statistical Distribution Plots
+    # Statistical Distribution Plots (figures cached per data window). The
+    # four charts take turns: each refresh moves one chart to the current
+    # window and the others reuse the cached figure of their last window,
+    # so only one figure is rebuilt per refresh (~2.5 Hz per chart)
+    window_sig = hash((len(data['timestamps']), float(data['timestamps'][0]), float(data['timestamps'][-1])))
+    frame = (st.session_state.distribution_frame + 1) % 4
+    st.session_state.distribution_frame = frame
+    chart_sigs = st.session_state.distribution_signatures
+    chart_sigs[frame] = window_sig
+    for k in range(4):
+        if chart_sigs[k] is None:
+            chart_sigs[k] = window_sig
     ui.render_section_title("Statistical Distribution Analysis", "Frequency distributions and quartile analysis for anomaly detection")
     
     col1, col2 = st.columns(2)
@@ -698,7 +723,9 @@ def render_main_dashboard():
             "Vibration Magnitude Distribution",
             "Magnitude (g)",
             color=ui.THEME['chart_vibration'],
-            baseline_value=baseline['vib_mean']
+            baseline_value=baseline['vib_mean'],
+            bin_edges=_hist_edges(vib_stats['min'], vib_stats['max']),
+            signature=chart_sigs[0]
         )
     
     with col2:
@@ -707,7 +734,8 @@ def render_main_dashboard():
             "Vibration Magnitude Box Plot",
             "Magnitude (g)",
             color=ui.THEME['chart_vibration'],
-            baseline_value=baseline['vib_mean']
+            baseline_value=baseline['vib_mean'],
+            signature=chart_sigs[1]
         )
     
     col3, col4 = st.columns(2)
@@ -718,7 +746,9 @@ def render_main_dashboard():
             "Temperature Distribution",
             "Temperature (°C)",
             color=ui.THEME['chart_temperature'],
-            baseline_value=baseline['temp_mean']
+            baseline_value=baseline['temp_mean'],
+            bin_edges=_hist_edges(temp_min, temp_max),
+            signature=chart_sigs[2]
         )
     
     with col4:
@@ -727,17 +757,23 @@ def render_main_dashboard():
             "Temperature Box Plot",
             "Temperature (°C)",
             color=ui.THEME['chart_temperature'],
-            baseline_value=baseline['temp_mean']
+            baseline_value=baseline['temp_mean'],
+            signature=chart_sigs[3]
         )
     
     ui.render_divider()
+
+
+@st.fragment(run_every=DIAGNOSTICS_REFRESH_INTERVAL)
+def _render_diagnostics():
+    """Render the system diagnostics panel (reruns on its own at 1 FPS)."""
+    
+    if st.session_state.data_source is None:
+        return
     
     # System Diagnostics
     stats = st.session_state.data_source.get_statistics()
     ui.render_diagnostics_panel(stats)
-    
-    # Icon Legend
-    ui.render_icon_legend()
 
 
 def main():
@@ -760,12 +796,8 @@ def main():
     # Render sidebar
     render_sidebar()
     
-    # Render main dashboard
+    # Render main dashboard (its live sections auto-refresh as a fragment)
     render_main_dashboard()
-    
-    # Auto-refresh
-    time.sleep(0.1)  # 10 FPS
-    st.rerun()
 
 
 if __name__ == "__main__":
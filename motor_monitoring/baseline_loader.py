@@ -4,10 +4,118 @@ Baseline Loader - Multi-speed Normal Profile Engine
 Loads baseline CSV files for different motor speeds and computes statistical signatures.
 """
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
-from utils import compute_vibration_magnitude_array
+from typing import Dict, Any, Optional, Tuple
+from utils import compute_vibration_magnitude_array, compute_percentiles, min_max_moments
+
+try:
+    import pyarrow  # noqa: F401  (enables the multithreaded pandas CSV engine)
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    _CSV_ENGINE = "c"
+
+# Column schema of baseline CSV files: timestamps need float64 for epoch
+# precision, sensor channels are stored as float32
+_CSV_DTYPES = {
+    'timestamp': 'float64',
+    'ax_g': 'float32',
+    'ay_g': 'float32',
+    'az_g': 'float32',
+    'temp_C': 'float32'
+}
+
+# Columns every baseline CSV must provide
+_REQUIRED_COLS = frozenset(_CSV_DTYPES)
+
+# Computed baselines are cached in .npz sidecar files next to their CSVs, so
+# later runs skip CSV parsing (bump the version when the statistics change).
+# The raw arrays go to one .npy file each, which is memory-mapped on load.
+_BASELINE_CACHE_VERSION = 2
+_BASELINE_CACHE_SUFFIX = ".baseline.npz"
+_BASELINE_RAW_KEYS = ('vib_mag_array', 'temp_array', 'timestamp_array')
+
+
+def _raw_cache_path(cache_path: str, key: str) -> str:
+    """
+    Get the .npy file holding one raw array of a baseline sidecar.
+    
+    Args:
+        cache_path: Path to the .npz sidecar file
+        key: Raw array key (e.g. 'vib_mag_array')
+        
+    Returns:
+        Path to the .npy file
+    """
+    return f"{os.path.splitext(cache_path)[0]}.{key}.npy"
+
+
+def _write_file_atomically(path: str, write):
+    """
+    Write a file through a temporary file so readers never see it partially written.
+    
+    Args:
+        path: Destination path
+        write: Function called with the open binary file object
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_csv(csv_path: str) -> pd.DataFrame:
+    """
+    Read a baseline CSV with an explicit column schema.
+    
+    Only the required columns are parsed, with fixed dtypes instead of
+    per-column type inference.
+    
+    Args:
+        csv_path: Path to CSV file
+        
+    Returns:
+        DataFrame with timestamp, ax_g, ay_g, az_g, temp_C columns
+    """
+    return pd.read_csv(csv_path, engine=_CSV_ENGINE, usecols=list(_CSV_DTYPES), dtype=_CSV_DTYPES)
+
+
+def _temperature_rate_stats(temps: np.ndarray, timestamps: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute mean and standard deviation of the temperature rate of change.
+    
+    Args:
+        temps: Array of temperatures in °C
+        timestamps: Array of timestamps in seconds (same length)
+        
+    Returns:
+        Tuple of (mean rate, rate std) in °C/s, 0.0 for fewer than 11 samples
+    """
+    # Simple approach: rate between consecutive samples
+    if len(temps) <= 10:
+        return 0.0, 0.0
+    
+    temp_diffs = np.diff(temps)
+    time_diffs = np.diff(timestamps)
+    
+    # Avoid division by zero
+    valid_mask = time_diffs > 0
+    if valid_mask.all():
+        temp_rates = temp_diffs / time_diffs
+    elif np.any(valid_mask):
+        temp_rates = temp_diffs[valid_mask] / time_diffs[valid_mask]
+    else:
+        return 0.0, 0.0
+    
+    temp_rate_std = np.std(temp_rates) if len(temp_rates) > 1 else 0.0
+    return np.mean(temp_rates), temp_rate_std
 
 
 class BaselineLoader:
@@ -15,16 +123,18 @@ class BaselineLoader:
     Loads and processes baseline CSV files for multiple motor speeds.
     """
     
-    def __init__(self, data_dir: str = "data", machine_type: str = "sumitomo"):
+    def __init__(self, data_dir: str = "data", machine_type: str = "sumitomo", keep_raw: bool = False):
         """
         Initialize the baseline loader.
         
         Args:
             data_dir: Base directory containing machine-specific subdirectories
             machine_type: Type of machine ("sumitomo" or "haas")
+            keep_raw: Keep the raw sample arrays in each baseline (for visualization)
         """
         self.data_dir = data_dir
         self.machine_type = machine_type
+        self.keep_raw = keep_raw
         self.baselines = {}
         
         # Different speed configurations for different machines
@@ -48,6 +158,7 @@ class BaselineLoader:
         
         if self.machine_type == "sumitomo":
             # Sumitomo: Load speed-based baselines
+            csv_paths = {}
             for speed in self.speeds:
                 csv_path = os.path.join(machine_data_dir, f"motor_{speed}pct.csv")
                 
@@ -55,12 +166,21 @@ class BaselineLoader:
                     print(f"⚠️  Warning: Baseline file not found: {csv_path}")
                     continue
                 
-                try:
-                    baseline = self._load_baseline(csv_path, speed)
-                    self.baselines[speed] = baseline
-                    print(f"✅ Loaded baseline for {speed}% speed")
-                except Exception as e:
-                    print(f"❌ Error loading {csv_path}: {str(e)}")
+                csv_paths[speed] = csv_path
+            
+            # The files are independent and CSV parsing / NumPy release the GIL,
+            # so load them in parallel (results are collected in speed order)
+            with ThreadPoolExecutor(max_workers=max(len(csv_paths), 1)) as executor:
+                futures = {speed: executor.submit(self._load_baseline, csv_path, speed)
+                           for speed, csv_path in csv_paths.items()}
+                
+                for speed, future in futures.items():
+                    try:
+                        baseline = future.result()
+                        self.baselines[speed] = baseline
+                        print(f"✅ Loaded baseline for {speed}% speed")
+                    except Exception as e:
+                        print(f"❌ Error loading {csv_paths[speed]}: {str(e)}")
         
         elif self.machine_type == "haas":
             # Haas: Load trajectory-based baseline (combine all good trajectories)
@@ -79,8 +199,8 @@ class BaselineLoader:
                 # Create baseline from ALL available CSV files (combining all trajectories)
                 csv_files = sorted([f for f in os.listdir(machine_data_dir) if f.endswith('.csv')])
                 if csv_files:
-                    print(f"📊 Creating Haas baseline from ALL {len(csv_files)} trajectory files...")
-                    print(f"   Files: {', '.join(csv_files[:5])}{'...' if len(csv_files) > 5 else ''}")
+                    print(f"📊 Creating Haas baseline from ALL {len(csv_files)} trajectory files...\n"
+                          f"   Files: {', '.join(csv_files[:5])}{'...' if len(csv_files) > 5 else ''}")
                     try:
                         baseline = self._load_combined_baseline(machine_data_dir, csv_files)
                         self.baselines["baseline"] = baseline
@@ -104,11 +224,18 @@ class BaselineLoader:
         Returns:
             Dictionary with baseline statistics
         """
+        cache_path = os.path.splitext(csv_path)[0] + _BASELINE_CACHE_SUFFIX
+        baseline = self._load_cached_baseline(cache_path, [csv_path], speed)
+        if baseline is not None:
+            return baseline
+        
         # Read CSV
-        df = pd.read_csv(csv_path)
+        df = _read_csv(csv_path)
         
         # Use the DataFrame-based method
-        return self._load_baseline_from_df(df, speed)
+        baseline = self._load_baseline_from_df(df, speed)
+        self._save_cached_baseline(cache_path, [csv_path], baseline)
+        return self._drop_raw_data(baseline)
     
     def _load_combined_baseline(self, data_dir: str, csv_files: list) -> Dict[str, Any]:
         """
@@ -122,35 +249,137 @@ class BaselineLoader:
         Returns:
             Combined baseline dictionary
         """
+        cache_path = os.path.join(data_dir, "combined" + _BASELINE_CACHE_SUFFIX)
+        csv_paths = [os.path.join(data_dir, csv_file) for csv_file in csv_files]
+        baseline = self._load_cached_baseline(cache_path, csv_paths, "baseline")
+        if baseline is not None:
+            print(f"   ✓ Using cached baseline {cache_path}")
+            return baseline
+        
         all_dfs = []
         loaded_count = 0
         
-        for csv_file in csv_files:
-            csv_path = os.path.join(data_dir, csv_file)
-            try:
-                df = pd.read_csv(csv_path)
-                required_cols = ['timestamp', 'ax_g', 'ay_g', 'az_g', 'temp_C']
-                if all(col in df.columns for col in required_cols):
-                    all_dfs.append(df)
-                    loaded_count += 1
-                else:
-                    print(f"⚠️  Warning: {csv_file} missing required columns, skipping")
-            except Exception as e:
-                print(f"⚠️  Warning: Could not load {csv_file}: {str(e)}")
+        # Parse the files in parallel, then check them in file order
+        with ThreadPoolExecutor(max_workers=min(len(csv_paths), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(_read_csv, csv_path) for csv_path in csv_paths]
+            
+            for csv_file, future in zip(csv_files, futures):
+                try:
+                    df = future.result()
+                    missing = _REQUIRED_COLS.difference(df.columns)
+                    if not missing:
+                        all_dfs.append(df)
+                        loaded_count += 1
+                    else:
+                        print(f"⚠️  Warning: {csv_file} missing required columns {sorted(missing)}, skipping")
+                except Exception as e:
+                    print(f"⚠️  Warning: Could not load {csv_file}: {str(e)}")
         
         if not all_dfs:
             raise ValueError("No valid CSV files found to create baseline")
         
         print(f"   ✓ Loaded {loaded_count}/{len(csv_files)} files successfully")
         
-        # Combine all dataframes into one comprehensive dataset
-        combined_df = pd.concat(all_dfs, ignore_index=True)
-        combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
+        # Combine all files into one comprehensive dataset: concatenate each
+        # column, then release the per-file frames before computing statistics
+        columns = [np.concatenate([df[col].to_numpy() for df in all_dfs])
+                   for col in ('timestamp', 'ax_g', 'ay_g', 'az_g', 'temp_C')]
+        del all_dfs
         
-        print(f"   ✓ Combined {len(combined_df)} total samples from all trajectories")
+        # Trajectory files are normally already in time order (sorted names carry
+        # the recording time), so only reorder by timestamp when they are not
+        if np.any(columns[0][1:] < columns[0][:-1]):
+            order = np.argsort(columns[0], kind='stable')
+            columns = [column[order] for column in columns]
+        timestamps, ax, ay, az, temps = columns
+        
+        print(f"   ✓ Combined {len(timestamps)} total samples from all trajectories")
         
         # Use the combined data to create baseline
-        return self._load_baseline_from_df(combined_df, "baseline")
+        baseline = self._load_baseline_from_arrays(timestamps, ax, ay, az, temps, "baseline")
+        self._save_cached_baseline(cache_path, csv_paths, baseline)
+        return self._drop_raw_data(baseline)
+    
+    def _drop_raw_data(self, baseline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Remove the raw sample arrays from a baseline unless keep_raw is set.
+        
+        Args:
+            baseline: Baseline dictionary
+            
+        Returns:
+            The same baseline dictionary
+        """
+        if not self.keep_raw:
+            for key in _BASELINE_RAW_KEYS:
+                baseline.pop(key, None)
+        return baseline
+    
+    def _load_cached_baseline(self, cache_path: str, source_paths: list, speed: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a baseline from its .npz sidecar if it is newer than its CSV files.
+        
+        Args:
+            cache_path: Path to the sidecar file
+            source_paths: CSV files the baseline was computed from
+            speed: Speed/trajectory identifier
+            
+        Returns:
+            Baseline dictionary, or None if the sidecar is missing or stale
+        """
+        if not os.path.exists(cache_path):
+            return None
+        if os.path.getmtime(cache_path) < max(os.path.getmtime(path) for path in source_paths):
+            return None
+        
+        try:
+            with np.load(cache_path, allow_pickle=False) as cache:
+                if int(cache['version']) != _BASELINE_CACHE_VERSION:
+                    return None
+                if cache['sources'].tolist() != [os.path.basename(path) for path in source_paths]:
+                    return None
+                
+                # Scalar statistics are stored as one vector, in dict order
+                baseline = {"speed": speed}
+                baseline.update(zip(cache['stat_keys'].tolist(), cache['stats'].tolist()))
+                baseline['sample_count'] = int(baseline['sample_count'])
+            
+            # Memory-map the raw arrays: pages are read only when they are used
+            if self.keep_raw:
+                for key in _BASELINE_RAW_KEYS:
+                    baseline[key] = np.load(_raw_cache_path(cache_path, key), mmap_mode='r',
+                                            allow_pickle=False)
+        except Exception as e:
+            print(f"⚠️  Warning: Ignoring unreadable baseline cache {cache_path}: {str(e)}")
+            return None
+        
+        return baseline
+    
+    def _save_cached_baseline(self, cache_path: str, source_paths: list, baseline: Dict[str, Any]):
+        """
+        Write a baseline to its .npz sidecar and raw .npy files (best effort).
+        
+        Args:
+            cache_path: Path to the sidecar file
+            source_paths: CSV files the baseline was computed from
+            baseline: Baseline dictionary
+        """
+        stat_keys = [key for key in baseline if key != "speed" and key not in _BASELINE_RAW_KEYS]
+        
+        try:
+            # Raw arrays first: a sidecar is only used once all its files exist
+            for key in _BASELINE_RAW_KEYS:
+                _write_file_atomically(_raw_cache_path(cache_path, key),
+                                       lambda f, key=key: np.save(f, baseline[key]))
+            
+            _write_file_atomically(cache_path, lambda f: np.savez(
+                f,
+                version=_BASELINE_CACHE_VERSION,
+                sources=np.array([os.path.basename(path) for path in source_paths]),
+                stat_keys=np.array(stat_keys),
+                stats=np.array([baseline[key] for key in stat_keys], dtype=np.float64)))
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write baseline cache {cache_path}: {str(e)}")
     
     def _load_baseline_from_df(self, df: pd.DataFrame, speed: str) -> Dict[str, Any]:
         """
@@ -164,58 +393,52 @@ class BaselineLoader:
             Baseline dictionary
         """
         # Validate required columns
-        required_cols = ['timestamp', 'ax_g', 'ay_g', 'az_g', 'temp_C']
-        if not all(col in df.columns for col in required_cols):
-            raise ValueError(f"DataFrame must contain columns: {required_cols}")
+        missing = _REQUIRED_COLS.difference(df.columns)
+        if missing:
+            raise ValueError(f"DataFrame missing required columns: {sorted(missing)}")
         
-        # Extract data
-        timestamps = df['timestamp'].values
-        ax = df['ax_g'].values
-        ay = df['ay_g'].values
-        az = df['az_g'].values
-        temps = df['temp_C'].values
+        return self._load_baseline_from_arrays(df['timestamp'].values, df['ax_g'].values,
+                                               df['ay_g'].values, df['az_g'].values,
+                                               df['temp_C'].values, speed)
+    
+    def _load_baseline_from_arrays(self, timestamps: np.ndarray, ax: np.ndarray, ay: np.ndarray,
+                                   az: np.ndarray, temps: np.ndarray, speed: str) -> Dict[str, Any]:
+        """
+        Create baseline from sensor data columns (used internally).
         
+        Args:
+            timestamps: Array of timestamps in seconds (ascending)
+            ax, ay, az: Arrays of acceleration values in g
+            temps: Array of temperatures in °C
+            speed: Speed/trajectory identifier
+            
+        Returns:
+            Baseline dictionary
+        """
         # Compute vibration magnitude
         vib_mag = compute_vibration_magnitude_array(ax, ay, az)
         
-        # Compute sampling rate
-        if len(timestamps) > 1:
-            time_diffs = np.diff(timestamps)
-            sampling_rate = 1.0 / np.mean(time_diffs) if np.mean(time_diffs) > 0 else 10.0
-        else:
-            sampling_rate = 10.0
-        
-        # Vibration statistics
-        vib_mean = np.mean(vib_mag)
-        vib_std = np.std(vib_mag)
-        vib_min = np.min(vib_mag)
-        vib_max = np.max(vib_mag)
-        vib_median = np.median(vib_mag)
-        vib_percentile_95 = np.percentile(vib_mag, 95)
-        
-        # Temperature statistics
-        temp_mean = np.mean(temps)
-        temp_std = np.std(temps)
-        temp_min = np.min(temps)
-        temp_max = np.max(temps)
-        temp_median = np.median(temps)
-        
-        # Temperature rate of change (simple approach)
-        if len(temps) > 10:
-            temp_diffs = np.diff(temps)
-            time_diffs = np.diff(timestamps)
-            # Avoid division by zero
-            valid_mask = time_diffs > 0
-            if np.any(valid_mask):
-                temp_rates = temp_diffs[valid_mask] / time_diffs[valid_mask]
-                temp_rate_mean = np.mean(temp_rates)
-                temp_rate_std = np.std(temp_rates) if len(temp_rates) > 1 else 0.0
-            else:
-                temp_rate_mean = 0.0
-                temp_rate_std = 0.0
-        else:
-            temp_rate_mean = 0.0
-            temp_rate_std = 0.0
+        # Compute sampling rate (the mean sample interval is the duration / (n - 1),
+        # so no np.diff pass is needed)
+        n = len(timestamps)
+        duration = float(timestamps[-1] - timestamps[0]) if n > 1 else 0.0
+        mean_dt = duration / (n - 1) if n > 1 else 0.0
+        sampling_rate = 1.0 / mean_dt if mean_dt > 0 else 10.0
+        
+        # Vibration and temperature statistics (min/max/mean/std in one fused
+        # reduction each)
+        vib_min, vib_max, vib_mean, vib_std = min_max_moments(vib_mag)
+        temp_min, temp_max, temp_mean, temp_std = min_max_moments(temps)
+        
+        # Temperature rate of change (its diff arrays are freed on return, before
+        # the partition copies below are allocated)
+        temp_rate_mean, temp_rate_std = _temperature_rate_stats(temps, timestamps)
+        
+        # Median and 95th percentile from a single partition pass
+        vib_percentiles = compute_percentiles(vib_mag, [50, 95])
+        vib_median = vib_percentiles['p50']
+        vib_percentile_95 = vib_percentiles['p95']
+        temp_median = compute_percentiles(temps, [50])['p50']
         
         # Compute threshold bands
         threshold_normal = vib_mean + 2 * vib_std
@@ -224,8 +447,8 @@ class BaselineLoader:
         # Build baseline dictionary
         baseline = {
             "speed": speed,
-            "sample_count": len(df),
-            "duration_sec": timestamps[-1] - timestamps[0] if len(timestamps) > 1 else 0,
+            "sample_count": n,
+            "duration_sec": duration,
             "sampling_rate_hz": sampling_rate,
             
             # Vibration statistics
@@ -252,7 +475,7 @@ class BaselineLoader:
             "temp_rate_mean": temp_rate_mean,
             "temp_rate_std": temp_rate_std,
             
-            # Raw data (for visualization if needed)
+            # Raw data (written to the sidecar cache; kept only with keep_raw)
             "vib_mag_array": vib_mag,
             "temp_array": temps,
             "timestamp_array": timestamps
@@ -287,22 +510,24 @@ class BaselineLoader:
         """
         Print a summary of all loaded baselines.
         """
-        print("\n" + "="*70)
-        print("BASELINE SUMMARY")
-        print("="*70)
+        # Build the whole summary first and print it with a single write
+        lines = ["\n" + "="*70, "BASELINE SUMMARY", "="*70]
         
         for speed in sorted(self.baselines.keys(), key=lambda x: int(x)):
             baseline = self.baselines[speed]
-            print(f"\n🔧 Speed: {speed}%")
-            print(f"   Samples: {baseline['sample_count']}")
-            print(f"   Duration: {baseline['duration_sec']:.1f} sec")
-            print(f"   Sampling Rate: {baseline['sampling_rate_hz']:.1f} Hz")
-            print(f"   Vibration: {baseline['vib_mean']:.4f} ± {baseline['vib_std']:.4f} g")
-            print(f"   Normal Threshold: {baseline['threshold_normal']:.4f} g")
-            print(f"   Caution Threshold: {baseline['threshold_caution']:.4f} g")
-            print(f"   Temperature: {baseline['temp_mean']:.2f} ± {baseline['temp_std']:.2f} °C")
-        
-        print("\n" + "="*70 + "\n")
+            lines += [
+                f"\n🔧 Speed: {speed}%",
+                f"   Samples: {baseline['sample_count']}",
+                f"   Duration: {baseline['duration_sec']:.1f} sec",
+                f"   Sampling Rate: {baseline['sampling_rate_hz']:.1f} Hz",
+                f"   Vibration: {baseline['vib_mean']:.4f} ± {baseline['vib_std']:.4f} g",
+                f"   Normal Threshold: {baseline['threshold_normal']:.4f} g",
+                f"   Caution Threshold: {baseline['threshold_caution']:.4f} g",
+                f"   Temperature: {baseline['temp_mean']:.2f} ± {baseline['temp_std']:.2f} °C"
+            ]
+        
+        lines.append("\n" + "="*70 + "\n")
+        print("\n".join(lines))
 
 
 # Convenience function
@@ -7,9 +7,18 @@ import pandas as pd
 import numpy as np
 import threading
 import time
-from collections import deque
 from typing import Optional, Dict, Any
-from utils import validate_sensor_data
+from utils import validate_sensor_batch
+from ring_buffer import SensorRingBuffer
+
+
+# Replay scheduling: each wake-up dispatches every data point that is due (up to
+# REPLAY_BATCH_SIZE of them), and wake-ups are at least REPLAY_WAKE_INTERVAL apart
+REPLAY_BATCH_SIZE = 64
+REPLAY_WAKE_INTERVAL = 0.01
+
+# Columns a replay CSV must provide
+_REQUIRED_COLS = frozenset(['timestamp', 'ax_g', 'ay_g', 'az_g', 'temp_C'])
 
 
 class DataReplay:
@@ -31,20 +40,24 @@ class DataReplay:
         self.loop = loop
         
         # Load CSV data
-        self.df = pd.read_csv(csv_path)
-        self._validate_csv()
+        df = pd.read_csv(csv_path)
+        self._validate_csv(df)
+        
+        # Keep the columns as NumPy arrays so replay never touches pandas
+        self.sample_count = len(df)
+        self._timestamps = df['timestamp'].to_numpy(dtype=np.float64)
+        self._ax = df['ax_g'].to_numpy(dtype=np.float32)
+        self._ay = df['ay_g'].to_numpy(dtype=np.float32)
+        self._az = df['az_g'].to_numpy(dtype=np.float32)
+        self._temp = df['temp_C'].to_numpy(dtype=np.float32)
         
         # Threading
         self.thread: Optional[threading.Thread] = None
         self.running = False
-        self.lock = threading.Lock()
+        self._stop_event = threading.Event()  # Interrupts the replay thread's waits
         
-        # Data buffers (matching SerialReader interface)
-        self.timestamps = deque(maxlen=10000)
-        self.ax_buffer = deque(maxlen=10000)
-        self.ay_buffer = deque(maxlen=10000)
-        self.az_buffer = deque(maxlen=10000)
-        self.temp_buffer = deque(maxlen=10000)
+        # Data buffer (matching SerialReader; lock-free: only the replay thread appends)
+        self.buffer = SensorRingBuffer(capacity=10000)
         
         # Replay state
         self.current_index = 0
@@ -55,15 +68,18 @@ class DataReplay:
         self.packet_count = 0
         self.buffer_duration = 10.0
         
-        print(f"📼 Loaded {len(self.df)} samples from {csv_path}")
+        print(f"📼 Loaded {self.sample_count} samples from {csv_path}")
     
-    def _validate_csv(self):
+    def _validate_csv(self, df: pd.DataFrame):
         """
         Validate CSV has required columns.
+        
+        Args:
+            df: DataFrame read from the CSV file
         """
-        required_cols = ['timestamp', 'ax_g', 'ay_g', 'az_g', 'temp_C']
-        if not all(col in self.df.columns for col in required_cols):
-            raise ValueError(f"CSV must contain columns: {required_cols}")
+        missing = _REQUIRED_COLS.difference(df.columns)
+        if missing:
+            raise ValueError(f"CSV missing required columns: {sorted(missing)}")
     
     def start(self):
         """
@@ -74,8 +90,12 @@ class DataReplay:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.start_time = time.time()
-        self.data_start_time = self.df['timestamp'].iloc[0]
+        self.data_start_time = float(self._timestamps[0])
+        # Running maximum: an out-of-order row is replayed with its predecessor's
+        # time, so the scheduling search and the ring see non-decreasing times
+        self._data_offsets = np.maximum.accumulate(self._timestamps - self.data_start_time)
         self.current_index = 0
         
         self.thread = threading.Thread(target=self._replay_loop, daemon=True)
@@ -90,6 +110,7 @@ class DataReplay:
             return
         
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=2.0)
         
@@ -99,10 +120,13 @@ class DataReplay:
         """
         Main replay loop (runs in separate thread).
         """
+        last_wake = 0.0
+        last_timestamp = 0.0
+        
         while self.running:
             try:
                 # Check if we've reached the end
-                if self.current_index >= len(self.df):
+                if self.current_index >= self.sample_count:
                     if self.loop:
                         print("🔄 Looping replay...")
                         self.current_index = 0
@@ -112,73 +136,59 @@ class DataReplay:
                         self.running = False
                         break
                 
-                # Get current data row
-                row = self.df.iloc[self.current_index]
-                
-                # Calculate when this data point should be sent
-                data_time = row['timestamp']
-                elapsed_data_time = (data_time - self.data_start_time) / self.playback_speed
-                target_time = self.start_time + elapsed_data_time
+                i = self.current_index
+                speed = self.playback_speed
                 
-                # Wait until target time
+                # Wait until the next data point should be sent
+                target_time = max(self.start_time + self._data_offsets[i] / speed,
+                                  last_wake + REPLAY_WAKE_INTERVAL)
                 current_time = time.time()
                 if current_time < target_time:
-                    time.sleep(target_time - current_time)
+                    if self._stop_event.wait(target_time - current_time):
+                        break
+                    current_time = time.time()
+                last_wake = current_time
+                
+                # Send every data point that is due by now as one batch
+                offsets = self._data_offsets[i:i + REPLAY_BATCH_SIZE]
+                due = max(int(np.searchsorted(offsets, (current_time - self.start_time) * speed, side='right')), 1)
                 
-                # Extract data
-                timestamp = time.time()  # Use current time for simulated real-time
-                ax = float(row['ax_g'])
-                ay = float(row['ay_g'])
-                az = float(row['az_g'])
-                temp = float(row['temp_C'])
+                # Stamp each point with its scheduled time (simulated real-time),
+                # never earlier than the previous point
+                timestamps = self.start_time + offsets[:due] / speed
+                np.maximum(timestamps, last_timestamp, out=timestamps)
+                last_timestamp = timestamps[-1]
                 
                 # Validate and add data
-                if validate_sensor_data(ax, ay, az, temp):
-                    self._add_data_point(timestamp, ax, ay, az, temp)
+                ax = self._ax[i:i + due]
+                ay = self._ay[i:i + due]
+                az = self._az[i:i + due]
+                temp = self._temp[i:i + due]
+                valid = validate_sensor_batch(ax, ay, az, temp)
+                if not valid.all():
+                    timestamps, ax, ay, az, temp = (timestamps[valid], ax[valid], ay[valid],
+                                                    az[valid], temp[valid])
+                self._add_data_batch(timestamps, ax, ay, az, temp)
                 
-                self.current_index += 1
+                self.current_index = i + due
                 
             except Exception as e:
                 print(f"⚠️  Replay error: {str(e)}")
-                time.sleep(0.1)
-    
-    def _add_data_point(self, timestamp: float, ax: float, ay: float, az: float, temp: float):
-        """
-        Add data point to buffers.
-        
-        Args:
-            timestamp: Unix timestamp
-            ax, ay, az: Acceleration in g
-            temp: Temperature in °C
-        """
-        with self.lock:
-            # Add to buffers
-            self.timestamps.append(timestamp)
-            self.ax_buffer.append(ax)
-            self.ay_buffer.append(ay)
-            self.az_buffer.append(az)
-            self.temp_buffer.append(temp)
-            
-            self.packet_count += 1
-            
-            # Trim old data
-            self._trim_old_data(timestamp)
+                self._stop_event.wait(0.1)
     
-    def _trim_old_data(self, current_timestamp: float):
+    def _add_data_batch(self, timestamps: np.ndarray, ax: np.ndarray, ay: np.ndarray,
+                        az: np.ndarray, temp: np.ndarray):
         """
-        Remove data older than buffer_duration.
+        Add a batch of data points to the buffer.
         
         Args:
-            current_timestamp: Current timestamp
+            timestamps: Array of Unix timestamps
+            ax, ay, az: Arrays of acceleration in g
+            temp: Array of temperatures in °C
         """
-        cutoff_time = current_timestamp - self.buffer_duration
-        
-        while self.timestamps and self.timestamps[0] < cutoff_time:
-            self.timestamps.popleft()
-            self.ax_buffer.popleft()
-            self.ay_buffer.popleft()
-            self.az_buffer.popleft()
-            self.temp_buffer.popleft()
+        # The ring has a single producer (this thread), so no lock is needed
+        self.buffer.extend(timestamps, ax, ay, az, temp)
+        self.packet_count += len(timestamps)
     
     def get_recent_data(self, duration: float = None) -> Dict[str, np.ndarray]:
         """
@@ -190,38 +200,20 @@ class DataReplay:
         Returns:
             Dictionary with arrays of timestamps, ax, ay, az, temp
         """
-        with self.lock:
-            if not self.timestamps:
-                return {
-                    'timestamps': np.array([]),
-                    'ax': np.array([]),
-                    'ay': np.array([]),
-                    'az': np.array([]),
-                    'temp': np.array([])
-                }
-            
-            timestamps = np.array(self.timestamps)
-            ax = np.array(self.ax_buffer)
-            ay = np.array(self.ay_buffer)
-            az = np.array(self.az_buffer)
-            temp = np.array(self.temp_buffer)
-            
-            if duration is not None and len(timestamps) > 0:
-                cutoff = timestamps[-1] - duration
-                mask = timestamps >= cutoff
-                timestamps = timestamps[mask]
-                ax = ax[mask]
-                ay = ay[mask]
-                az = az[mask]
-                temp = temp[mask]
+        # Zero-copy views of the ring (None = the last buffer_duration seconds)
+        return self.buffer.view_recent(self.buffer_duration if duration is None else duration)
+    
+    def get_relative_timestamps(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Get seconds before the latest sample for data from get_recent_data.
+        
+        Args:
+            timestamps: The 'timestamps' array returned by get_recent_data
             
-            return {
-                'timestamps': timestamps,
-                'ax': ax,
-                'ay': ay,
-                'az': az,
-                'temp': temp
-            }
+        Returns:
+            Array of seconds ago (reused buffer, valid until the next call)
+        """
+        return self.buffer.relative_timestamps(timestamps)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -230,13 +222,13 @@ class DataReplay:
         Returns:
             Dictionary with statistics
         """
-        with self.lock:
-            buffer_size = len(self.timestamps)
-            buffer_duration_actual = 0.0
-            if len(self.timestamps) > 1:
-                buffer_duration_actual = self.timestamps[-1] - self.timestamps[0]
-            
-            progress = (self.current_index / len(self.df)) * 100 if len(self.df) > 0 else 0
+        timestamps = self.buffer.view_recent(self.buffer_duration)['timestamps']
+        buffer_size = len(timestamps)
+        buffer_duration_actual = 0.0
+        if buffer_size > 1:
+            buffer_duration_actual = float(timestamps[-1] - timestamps[0])
+        
+        progress = (self.current_index / self.sample_count) * 100 if self.sample_count > 0 else 0
         
         return {
             'mode': 'replay',
@@ -268,14 +260,14 @@ class DataReplay:
         if was_running:
             self.stop()
         
+        # The ring may only be cleared with its producer stopped: wait for the
+        # replay thread to exit (also when it already finished on its own)
+        if self.thread is not None:
+            self.thread.join()
+        
         # Clear buffers
-        with self.lock:
-            self.timestamps.clear()
-            self.ax_buffer.clear()
-            self.ay_buffer.clear()
-            self.az_buffer.clear()
-            self.temp_buffer.clear()
-            self.packet_count = 0
+        self.buffer.clear()
+        self.packet_count = 0
         
         if was_running:
             self.start()
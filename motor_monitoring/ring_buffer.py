@@ -0,0 +1,176 @@
+"""
+Sensor Ring Buffer - Lock-free Sample Storage
+
+Preallocated columnar storage shared by the serial and replay data sources.
+"""
+import numpy as np
+from typing import Dict
+
+
+class SensorRingBuffer:
+    """
+    Single-producer ring buffer of sensor samples in preallocated NumPy arrays.
+    
+    Only the acquisition thread writes samples and advances `count`; readers
+    only read `count`, so the data path needs no lock. Every sample is stored
+    twice (at i and i + size), so the most recent samples are always one
+    contiguous slice and readers get views instead of copies.
+    
+    Producers must append non-decreasing timestamps (SerialReader shifts a
+    clock that steps back, DataReplay clamps its batches). view_recent and
+    AnomalyEngine find time windows by binary search on that order.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize the ring buffer.
+        
+        Args:
+            capacity: Maximum number of samples returned by view_recent
+        """
+        self.capacity = capacity
+        
+        # The ring holds twice the readable capacity, so a returned view stays
+        # valid until the producer has written another `capacity` samples
+        self._size = 2 * capacity
+        
+        # Timestamps are epoch seconds (float64); sensor channels are float32
+        self.timestamps = np.zeros(2 * self._size)
+        self.ax = np.zeros(2 * self._size, dtype=np.float32)
+        self.ay = np.zeros(2 * self._size, dtype=np.float32)
+        self.az = np.zeros(2 * self._size, dtype=np.float32)
+        self.temp = np.zeros(2 * self._size, dtype=np.float32)
+        
+        # Total samples written (only the producer advances it)
+        self.count = 0
+        
+        # Reused output of relative_timestamps() (reader side)
+        self._relative = np.empty(capacity, dtype=np.float32)
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    def append(self, timestamp: float, ax: float, ay: float, az: float, temp: float):
+        """
+        Append one sample (producer thread only).
+        
+        Args:
+            timestamp: Unix timestamp (not earlier than the previous sample)
+            ax, ay, az: Acceleration in g
+            temp: Temperature in °C
+        """
+        i = self.count % self._size
+        j = i + self._size
+        
+        self.timestamps[i] = self.timestamps[j] = timestamp
+        self.ax[i] = self.ax[j] = ax
+        self.ay[i] = self.ay[j] = ay
+        self.az[i] = self.az[j] = az
+        self.temp[i] = self.temp[j] = temp
+        
+        # Publish the sample only once it is fully written
+        self.count += 1
+    
+    def extend(self, timestamps: np.ndarray, ax: np.ndarray, ay: np.ndarray,
+               az: np.ndarray, temp: np.ndarray):
+        """
+        Append a batch of samples with one slice assignment per column
+        (producer thread only).
+        
+        Args:
+            timestamps: Array of Unix timestamps (non-decreasing, not earlier
+                than the previous sample)
+            ax, ay, az: Arrays of acceleration in g
+            temp: Array of temperatures in °C
+        """
+        n = len(timestamps)
+        if n == 0:
+            return
+        
+        # Samples older than the last `capacity` could never be read
+        skip = max(n - self.capacity, 0)
+        m = n - skip
+        start = (self.count + skip) % self._size
+        first = min(m, self._size - start)  # Samples before the ring wraps
+        
+        for column, values in ((self.timestamps, timestamps), (self.ax, ax), (self.ay, ay),
+                               (self.az, az), (self.temp, temp)):
+            values = values[skip:]
+            column[start:start + first] = values[:first]
+            column[start + self._size:start + self._size + first] = values[:first]
+            if first < m:
+                column[:m - first] = values[first:]
+                column[self._size:self._size + m - first] = values[first:]
+        
+        # Publish the batch only once it is fully written
+        self.count += n
+    
+    def clear(self):
+        """
+        Drop all samples (call only while the producer is stopped).
+        """
+        self.count = 0
+    
+    def view_recent(self, duration: float = None) -> Dict[str, np.ndarray]:
+        """
+        Get read-only views of the most recent samples.
+        
+        Args:
+            duration: Duration in seconds (None = up to `capacity` samples)
+        
+        Returns:
+            Dictionary with arrays of timestamps, ax, ay, az, temp
+        """
+        count = self.count  # Snapshot; later appends do not affect this window
+        n = min(count, self.capacity)
+        
+        if n == 0:
+            return {
+                'timestamps': np.array([]),
+                'ax': np.array([], dtype=np.float32),
+                'ay': np.array([], dtype=np.float32),
+                'az': np.array([], dtype=np.float32),
+                'temp': np.array([], dtype=np.float32)
+            }
+        
+        end = (count - 1) % self._size + 1
+        start = end - n
+        if start < 0:
+            # Use the mirrored copy so the window is contiguous
+            start += self._size
+            end += self._size
+        
+        if duration is not None:
+            # Timestamps are non-decreasing, so the cutoff is a binary search
+            timestamps = self.timestamps[start:end]
+            start += int(np.searchsorted(timestamps, timestamps[-1] - duration, side='left'))
+        
+        views = {
+            'timestamps': self.timestamps[start:end],
+            'ax': self.ax[start:end],
+            'ay': self.ay[start:end],
+            'az': self.az[start:end],
+            'temp': self.temp[start:end]
+        }
+        for view in views.values():
+            view.flags.writeable = False
+        
+        return views
+    
+    def relative_timestamps(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Get seconds before the latest sample for a window from view_recent.
+        
+        The result is written into a preallocated buffer, so it is only valid
+        until the next call.
+        
+        Args:
+            timestamps: Timestamps view returned by view_recent
+        
+        Returns:
+            Array of seconds ago (float32, 0 for the latest sample)
+        """
+        n = len(timestamps)
+        if n == 0:
+            return self._relative[:0]
+        return np.subtract(timestamps[-1], timestamps, out=self._relative[:n])
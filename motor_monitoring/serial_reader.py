@@ -12,6 +12,11 @@ from collections import deque
 from typing import Optional, Dict, Any, List, Tuple
 import numpy as np
 from utils import validate_sensor_data
+from ring_buffer import SensorRingBuffer
+
+
+# Longest partial line kept between reads (a sensor line is ~30-50 bytes)
+MAX_PENDING_BYTES = 4096
 
 
 class SerialReader:
@@ -39,22 +44,27 @@ class SerialReader:
         # Threading
         self.thread: Optional[threading.Thread] = None
         self.running = False
-        self.lock = threading.Lock()
+        self._stop_event = threading.Event()  # Interrupts the reader thread's waits
         
-        # Data buffers (using deque for efficient append/pop)
-        self.timestamps = deque(maxlen=10000)
-        self.ax_buffer = deque(maxlen=10000)
-        self.ay_buffer = deque(maxlen=10000)
-        self.az_buffer = deque(maxlen=10000)
-        self.temp_buffer = deque(maxlen=10000)
+        # Data buffer (lock-free: only the reader thread appends)
+        self.buffer = SensorRingBuffer(capacity=10000)
+        
+        # Stored timestamps must never decrease (see SensorRingBuffer); a clock
+        # that steps back is shifted by this offset to continue from the last one
+        self._last_timestamp = float('-inf')
+        self._timestamp_offset = 0.0
         
         # Statistics
         self.packet_count = 0
         self.error_count = 0
         self.dropped_packets = 0
-        self.last_packet_time = 0
+        self.last_packet_time = 0  # time.monotonic() of the last packet
         self.fps = 0.0
-        self.fps_samples = deque(maxlen=30)
+        
+        # Line parser: generic until the first good line fixes the format
+        self._line_parser = self._parse_line
+        
+        self.packet_times = deque(maxlen=31)  # Monotonic arrival times of the last 31 packets (30 intervals)
         
     def auto_detect_port(self) -> Optional[str]:
         """
@@ -113,6 +123,9 @@ class SerialReader:
             # Flush any initial garbage data
             self.serial_conn.reset_input_buffer()
             
+            # Detect the line format again from the first good line
+            self._line_parser = self._parse_line
+            
             self.connected = True
             print(f"✅ Connected to {self.port} at {self.baud_rate} baud")
             return True
@@ -144,6 +157,7 @@ class SerialReader:
                 raise ConnectionError("Could not connect to serial port")
         
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._read_loop, daemon=True)
         self.thread.start()
         print("▶️  Serial reader started")
@@ -156,6 +170,17 @@ class SerialReader:
             return
         
         self.running = False
+        self._stop_event.set()
+        
+        # Wake a read that is waiting for data instead of letting it run out
+        # its 1 s timeout (pyserial cancels through the OS wait on POSIX and Windows)
+        cancel_read = getattr(self.serial_conn, 'cancel_read', None)
+        if cancel_read is not None:
+            try:
+                cancel_read()
+            except Exception:
+                pass
+        
         if self.thread:
             self.thread.join(timeout=2.0)
         
@@ -166,58 +191,86 @@ class SerialReader:
         """
         Main reading loop (runs in separate thread).
         """
+        pending = b""  # Incomplete line carried over to the next read
+        add_data_point = self._add_data_point  # Bound once instead of per line
+        
         while self.running:
             try:
-                # Read line from serial
-                if not self.serial_conn or not self.serial_conn.is_open:
+                # Read line from serial (one attribute lookup per read, not per use)
+                conn = self.serial_conn
+                if not conn or not conn.is_open:
                     # Try to reconnect
                     print("⚠️  Connection lost, attempting reconnect...")
-                    time.sleep(1.0)
+                    if self._stop_event.wait(1.0):
+                        break
                     if not self.connect():
-                        time.sleep(2.0)
+                        if self._stop_event.wait(2.0):
+                            break
                         continue
+                    conn = self.serial_conn
+                    pending = b""
                 
-                # Read and decode line
-                line = self.serial_conn.readline().decode('utf-8', errors='ignore').strip()
-                
-                if not line:
+                # Read everything that has arrived in one call and split it into
+                # lines. The wait for the first byte is pyserial's select() on the
+                # port, so the thread wakes as soon as data arrives
+                chunk = conn.read(max(1, conn.in_waiting))
+                if not chunk:
                     continue
                 
-                # Skip header line if present (Arduino sends "ax_g,ay_g,az_g,temp_C")
-                if line.lower().startswith('ax_g') or line.lower().startswith('timestamp'):
-                    continue
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                if len(pending) > MAX_PENDING_BYTES:
+                    # No line break in sight: drop the garbage
+                    pending = b""
                 
-                # Parse data
-                data = self._parse_line(line)
-                if data is not None:
-                    self._add_data_point(*data)
+                for line in lines:
+                    # Lines stay bytes: the data is ASCII CSV and float() accepts bytes
+                    line = line.strip()
+                    
+                    if not line:
+                        continue
+                    
+                    # Skip header line if present (Arduino sends "ax_g,ay_g,az_g,temp_C").
+                    # Data lines start with a digit, '-' or '.', so only lines starting
+                    # with a/A/t/T get the full check
+                    if line[0] in b'aAtT' and (line[:4].lower() == b'ax_g' or
+                                               line[:9].lower() == b'timestamp'):
+                        continue
+                    
+                    # Parse data (self._line_parser is looked up per line because
+                    # the first good line rebinds it)
+                    data = self._line_parser(line)
+                    if data is not None:
+                        add_data_point(*data)
                     
             except serial.SerialException as e:
                 print(f"⚠️  Serial error: {str(e)}")
                 self.error_count += 1
                 self.connected = False
-                time.sleep(1.0)
+                self._stop_event.wait(1.0)
                 
             except Exception as e:
                 print(f"⚠️  Unexpected error: {str(e)}")
                 self.error_count += 1
-                time.sleep(0.1)
+                self._stop_event.wait(0.1)
     
-    def _parse_line(self, line: str) -> Optional[Tuple[float, float, float, float, float]]:
+    def _parse_line(self, line: bytes) -> Optional[Tuple[float, float, float, float, float]]:
         """
         Parse CSV line: ax_g,ay_g,az_g,temp_C (Arduino format)
         OR timestamp,ax_g,ay_g,az_g,temp_C (if timestamp included)
         
         Automatically adds timestamp if not present (like data collection script).
+        The first line that parses fixes the format for the session: later lines
+        go to the specialized _parse_4_fields / _parse_5_fields parser.
         
         Args:
-            line: CSV line string
+            line: CSV line as raw bytes (without line ending)
             
         Returns:
             Tuple of (timestamp, ax, ay, az, temp) or None if invalid
         """
         try:
-            parts = line.split(',')
+            parts = line.split(b',')
             
             # Check if timestamp is already included (5 parts) or not (4 parts)
             if len(parts) == 5:
@@ -227,6 +280,7 @@ class SerialReader:
                 ay = float(parts[2])
                 az = float(parts[3])
                 temp = float(parts[4])
+                self._line_parser = self._parse_5_fields
             elif len(parts) == 4:
                 # Format: ax_g,ay_g,az_g,temp_C (Arduino format)
                 # Add timestamp immediately when data is received (most accurate)
@@ -235,6 +289,7 @@ class SerialReader:
                 ay = float(parts[1])
                 az = float(parts[2])
                 temp = float(parts[3])
+                self._line_parser = self._parse_4_fields
             else:
                 return None
             
@@ -249,53 +304,99 @@ class SerialReader:
             self.error_count += 1
             return None
     
-    def _add_data_point(self, timestamp: float, ax: float, ay: float, az: float, temp: float):
+    def _parse_4_fields(self, line: bytes) -> Optional[Tuple[float, float, float, float, float]]:
         """
-        Add data point to buffers with thread safety.
+        Parse an Arduino format line (ax_g,ay_g,az_g,temp_C) once the format is known.
         
         Args:
-            timestamp: Unix timestamp
-            ax, ay, az: Acceleration in g
-            temp: Temperature in °C
-        """
-        with self.lock:
-            # Add to buffers
-            self.timestamps.append(timestamp)
-            self.ax_buffer.append(ax)
-            self.ay_buffer.append(ay)
-            self.az_buffer.append(az)
-            self.temp_buffer.append(temp)
-            
-            # Update statistics
-            self.packet_count += 1
-            current_time = time.time()
-            
-            if self.last_packet_time > 0:
-                dt = current_time - self.last_packet_time
-                if dt > 0:
-                    self.fps_samples.append(1.0 / dt)
-                    self.fps = np.mean(list(self.fps_samples))
+            line: CSV line as raw bytes (without line ending)
             
-            self.last_packet_time = current_time
+        Returns:
+            Tuple of (timestamp, ax, ay, az, temp) or None if invalid
+        """
+        # Add timestamp immediately when data is received (most accurate)
+        timestamp = time.time()
+        try:
+            # Unpacking checks the field count without len() or indexing
+            ax, ay, az, temp = line.split(b',')
+            ax, ay, az, temp = float(ax), float(ay), float(az), float(temp)
+        except ValueError:
+            # Bad number or wrong field count
+            self.error_count += 1
+            return None
+        
+        # Validate data
+        if not validate_sensor_data(ax, ay, az, temp):
+            self.dropped_packets += 1
+            return None
+        
+        return (timestamp, ax, ay, az, temp)
+    
+    def _parse_5_fields(self, line: bytes) -> Optional[Tuple[float, float, float, float, float]]:
+        """
+        Parse a timestamped line (timestamp,ax_g,ay_g,az_g,temp_C) once the format is known.
+        
+        Args:
+            line: CSV line as raw bytes (without line ending)
             
-            # Trim old data (keep only buffer_duration seconds)
-            self._trim_old_data(timestamp)
+        Returns:
+            Tuple of (timestamp, ax, ay, az, temp) or None if invalid
+        """
+        try:
+            # Unpacking checks the field count without len() or indexing
+            timestamp, ax, ay, az, temp = line.split(b',')
+            timestamp, ax, ay, az, temp = float(timestamp), float(ax), float(ay), float(az), float(temp)
+        except ValueError:
+            # Bad number or wrong field count
+            self.error_count += 1
+            return None
+        
+        # Validate data
+        if not validate_sensor_data(ax, ay, az, temp):
+            self.dropped_packets += 1
+            return None
+        
+        return (timestamp, ax, ay, az, temp)
     
-    def _trim_old_data(self, current_timestamp: float):
+    def _add_data_point(self, timestamp: float, ax: float, ay: float, az: float, temp: float):
         """
-        Remove data older than buffer_duration.
+        Add data point to the buffer and update statistics.
         
         Args:
-            current_timestamp: Current timestamp
+            timestamp: Unix timestamp
+            ax, ay, az: Acceleration in g
+            temp: Temperature in °C
         """
-        cutoff_time = current_timestamp - self.buffer_duration
-        
-        while self.timestamps and self.timestamps[0] < cutoff_time:
-            self.timestamps.popleft()
-            self.ax_buffer.popleft()
-            self.ay_buffer.popleft()
-            self.az_buffer.popleft()
-            self.temp_buffer.popleft()
+        # The ring's time windows need non-decreasing timestamps. Timestamped
+        # lines carry the device clock (which restarts on an Arduino reset) and
+        # time.time() can be adjusted backwards, so a backward step is absorbed
+        # into an offset: later samples continue from the last stored timestamp
+        # with their original spacing
+        timestamp += self._timestamp_offset
+        if timestamp < self._last_timestamp:
+            self._timestamp_offset += self._last_timestamp - timestamp
+            timestamp = self._last_timestamp
+        self._last_timestamp = timestamp
+        
+        # The ring has a single producer (this thread), so no lock is needed
+        self.buffer.append(timestamp, ax, ay, az, temp)
+        
+        # Update statistics (also written only by this thread; readers may see
+        # values one packet old, so they are not locked either)
+        self.packet_count += 1
+        
+        # Arrival clock for the rate: monotonic, so wall-clock adjustments
+        # (NTP, DST) cannot produce negative or huge windows. Sample timestamps
+        # stay epoch seconds for the dashboard and the logged CSVs
+        current_time = time.monotonic()
+        
+        # Packet rate over the last 30 intervals, updated in O(1)
+        self.packet_times.append(current_time)
+        window = current_time - self.packet_times[0]
+        if window > 0:
+            self.fps = (len(self.packet_times) - 1) / window
+        
+        self.last_packet_time = current_time
     
     def get_recent_data(self, duration: float = None) -> Dict[str, np.ndarray]:
         """
@@ -307,38 +408,20 @@ class SerialReader:
         Returns:
             Dictionary with arrays of timestamps, ax, ay, az, temp
         """
-        with self.lock:
-            if not self.timestamps:
-                return {
-                    'timestamps': np.array([]),
-                    'ax': np.array([]),
-                    'ay': np.array([]),
-                    'az': np.array([]),
-                    'temp': np.array([])
-                }
-            
-            timestamps = np.array(self.timestamps)
-            ax = np.array(self.ax_buffer)
-            ay = np.array(self.ay_buffer)
-            az = np.array(self.az_buffer)
-            temp = np.array(self.temp_buffer)
-            
-            if duration is not None and len(timestamps) > 0:
-                cutoff = timestamps[-1] - duration
-                mask = timestamps >= cutoff
-                timestamps = timestamps[mask]
-                ax = ax[mask]
-                ay = ay[mask]
-                az = az[mask]
-                temp = temp[mask]
+        # Zero-copy views of the ring (None = the last buffer_duration seconds)
+        return self.buffer.view_recent(self.buffer_duration if duration is None else duration)
+    
+    def get_relative_timestamps(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Get seconds before the latest sample for data from get_recent_data.
+        
+        Args:
+            timestamps: The 'timestamps' array returned by get_recent_data
             
-            return {
-                'timestamps': timestamps,
-                'ax': ax,
-                'ay': ay,
-                'az': az,
-                'temp': temp
-            }
+        Returns:
+            Array of seconds ago (reused buffer, valid until the next call)
+        """
+        return self.buffer.relative_timestamps(timestamps)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -347,11 +430,11 @@ class SerialReader:
         Returns:
             Dictionary with statistics
         """
-        with self.lock:
-            buffer_size = len(self.timestamps)
-            buffer_duration_actual = 0.0
-            if len(self.timestamps) > 1:
-                buffer_duration_actual = self.timestamps[-1] - self.timestamps[0]
+        timestamps = self.buffer.view_recent(self.buffer_duration)['timestamps']
+        buffer_size = len(timestamps)
+        buffer_duration_actual = 0.0
+        if buffer_size > 1:
+            buffer_duration_actual = float(timestamps[-1] - timestamps[0])
         
         return {
             'connected': self.connected,
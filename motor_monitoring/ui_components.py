@@ -3,11 +3,14 @@ UI Components - Premium Tesla/Porsche/Apple-Style Dashboard
 
 Premium dark-themed dashboard with sophisticated visualizations.
 """
+import time
+from functools import lru_cache
 import streamlit as st
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from utils import downsample_minmax, compute_percentiles, min_max_moments
 
 
 # Premium Dark Theme Color Palette (Tesla/Porsche/Apple inspired)
@@ -43,11 +46,21 @@ THEME = {
 }
 
 
-def apply_premium_style():
-    """
-    Apply premium dark theme CSS (Tesla/Porsche/Apple style).
-    """
-    st.markdown(f"""
+# Font and axis styling shared by the 2D charts (time series, histogram, box).
+# Plotly copies these into each figure, so the dicts are never mutated
+_CHART_FONT = {'family': 'Inter', 'color': THEME['text_secondary'], 'size': 12}
+_CHART_AXIS = {
+    'showgrid': True,
+    'gridwidth': 1,
+    'gridcolor': THEME['chart_grid'],
+    'zeroline': False,
+    'showline': True,
+    'linecolor': THEME['chart_axis'],
+    'linewidth': 1
+}
+
+# Premium dark theme CSS, formatted once at import since THEME is constant
+_PREMIUM_CSS = f"""
         <style>
         /* Import premium font */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
@@ -320,7 +333,30 @@ def apply_premium_style():
             border-color: {THEME['accent_primary']};
         }}
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def apply_premium_style():
+    """
+    Apply premium dark theme CSS (Tesla/Porsche/Apple style).
+    """
+    st.markdown(_PREMIUM_CSS, unsafe_allow_html=True)
+
+
+# Per health level (see _health_level): danger, caution, normal
+_HEALTH_COLORS = (THEME['status_danger'], THEME['status_caution'], THEME['status_normal'])
+_HEALTH_STATUS = (
+    ("✕", "Critical deviations detected - inspection recommended"),
+    ("⚠", "Some metrics show deviation from baseline"),
+    ("✓", "All systems operating within normal parameters")
+)
+
+
+def _health_level(health_score: float) -> int:
+    """
+    Get the health level of a score: 0 = danger (<30), 1 = caution (<70), 2 = normal.
+    """
+    return (health_score >= 30) + (health_score >= 70)
 
 
 def render_header(title: str, subtitle: str = None):
@@ -332,22 +368,31 @@ def render_header(title: str, subtitle: str = None):
         st.markdown(f'<div class="subtitle">{subtitle}</div>', unsafe_allow_html=True)
 
 
-def render_health_gauge(label: str, value: float, color: str, col=None, size: int = 200):
+def render_health_gauge(label: str, value: float, color: str, col=None, size: int = 200) -> go.Figure:
     """
     Render premium circular health gauge with dark theme.
+    
+    The gauge goes into col if given (else the current container). The
+    (cached, shared) figure is returned so callers can place it again.
     """
-    # Determine gauge color based on value
-    if value >= 70:
-        gauge_color = THEME['status_normal']
-    elif value >= 30:
-        gauge_color = THEME['status_caution']
-    else:
-        gauge_color = THEME['status_danger']
+    # Use provided color if specified, else color by health level
+    gauge_color = color or _HEALTH_COLORS[_health_level(value)]
     
-    # Use provided color if specified
-    if color:
-        gauge_color = color
+    # The gauge shows one decimal, so scores that round alike share a figure
+    fig = _build_health_gauge_figure(label, round(float(value), 1), gauge_color, size)
     
+    (col or st).plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _build_health_gauge_figure(label: str, value: float, gauge_color: str, size: int) -> go.Figure:
+    """
+    Build the health gauge figure (see render_health_gauge).
+    
+    Cached as a resource: a hit returns the same figure object, which
+    st.plotly_chart only reads, instead of unpickling a copy.
+    """
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
         value=value,
@@ -391,7 +436,7 @@ def render_health_gauge(label: str, value: float, color: str, col=None, size: in
     
     fig.update_layout(
         height=size,
-        margin=dict(l=10, r=10, t=50, b=10),
+        margin={'l': 10, 'r': 10, 't': 50, 'b': 10},
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
         font={'family': 'Inter', 'color': THEME['text_primary']},
@@ -405,10 +450,7 @@ def render_health_gauge(label: str, value: float, color: str, col=None, size: in
         }
     )
     
-    if col:
-        col.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-    else:
-        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
 
 
 def render_status_card(state: str, color: str, messages: List[str], health_score: float):
@@ -417,15 +459,7 @@ def render_status_card(state: str, color: str, messages: List[str], health_score
     Flattens HTML to prevent code block rendering.
     """
     # Get status emoji
-    if health_score >= 70:
-        emoji = "✓"
-        status_desc = "All systems operating within normal parameters"
-    elif health_score >= 30:
-        emoji = "⚠"
-        status_desc = "Some metrics show deviation from baseline"
-    else:
-        emoji = "✕"
-        status_desc = "Critical deviations detected - inspection recommended"
+    emoji, status_desc = _HEALTH_STATUS[_health_level(health_score)]
     
     # Flattened HTML structure
     status_html = f'<div class="status-card" style="border-left-color: {color};"><div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 12px;"><div style="display: flex; align-items: center;"><span class="status-indicator" style="color: {color}; background-color: {color};"></span><div><div style="font-size: 28px; font-weight: 700; color: {color}; letter-spacing: -0.5px;">{state}</div><div style="font-size: 13px; color: #6B7280; font-weight: 500; margin-top: 2px;">{status_desc}</div></div></div><div style="display: flex; align-items: center; gap: 16px;"><div style="text-align: right;"><div style="font-size: 13px; color: #6B7280; font-weight: 500; margin-bottom: 4px;">Health Score</div><div style="font-size: 32px; font-weight: 700; color: {color};">{health_score:.0f}%</div></div><div style="font-size: 48px; font-weight: 700; color: {color}; opacity: 0.2;">{emoji}</div></div></div><div style="margin-top: 16px; padding-top: 16px; border-top: 1px solid rgba(255, 255, 255, 0.06);">'
@@ -441,76 +475,125 @@ def render_status_card(state: str, color: str, messages: List[str], health_score
 def render_time_series_plot(timestamps: np.ndarray, values: np.ndarray, 
                             title: str, ylabel: str, color: str = THEME['chart_vibration'],
                             threshold_bands: Dict[str, float] = None,
-                            baseline_value: float = None):
+                            baseline_value: float = None,
+                            max_points: int = 1500):
     """
     Render premium dark-themed time series plot.
+    
+    Series longer than max_points are reduced to the min and max of equal
+    buckets before plotting (None = plot every sample), so the figure stays
+    the same size as the buffer grows while spikes remain visible.
+    
+    The figure is built once per chart (keyed by title) and kept in session
+    state. Later calls with the same styling, bands and baseline only replace
+    the trace data and the top of the danger band, instead of rebuilding the
+    whole figure with its shapes and annotations.
     """
-    fig = go.Figure()
+    if max_points:
+        timestamps, values = downsample_minmax(timestamps, values, max_points)
+    
+    if baseline_value is not None and len(timestamps) == 0:
+        baseline_value = None  # No baseline line without data
+    spec = (ylabel, color, baseline_value,
+            (threshold_bands.get('normal', 0), threshold_bands.get('caution', 0)) if threshold_bands else None)
+    
+    figures = st.session_state.setdefault('_time_series_figures', {})
+    cached = figures.get(title)
+    if cached is None or cached[0] != spec:
+        fig = _build_time_series_figure(timestamps, values, title, ylabel, color,
+                                        threshold_bands, baseline_value)
+        figures[title] = (spec, fig)
+    else:
+        fig = cached[1]
+        with fig.batch_update():
+            fig.data[0].x = timestamps
+            fig.data[0].y = values
+            if threshold_bands:
+                # The danger band (third shape) and its label follow the data maximum
+                max_val = _danger_band_top(values, spec[3][1])
+                fig.layout.shapes[2].y1 = max_val
+                fig.layout.annotations[2].y = max_val
+    
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+
+@lru_cache(maxsize=64)
+def _hex_to_rgba(hex_color: str, alpha: float = 0.2) -> str:
+    """
+    Convert a '#RRGGBB' color to an rgba() string (cached: charts use a few THEME colors).
+    """
+    hex_color = hex_color.lstrip('#')
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    return f'rgba({r}, {g}, {b}, {alpha})'
+
+
+def _danger_band_top(values: np.ndarray, caution: float) -> float:
+    """
+    Get the upper edge of the danger band for a time series plot.
+    """
+    if values.size:
+        # NumPy reduction (the builtin max() iterates the array in Python)
+        return float(values.max()) * 1.2
+    return caution * 1.5
+
+
+def _build_time_series_figure(timestamps: np.ndarray, values: np.ndarray, title: str, ylabel: str,
+                              color: str, threshold_bands: Dict[str, float],
+                              baseline_value: float) -> go.Figure:
+    """
+    Build the time series figure (see render_time_series_plot).
+    """
+    # Bands and the baseline line are collected as plain layout specs and
+    # attached once (add_hrect/add_hline validate and append every shape and
+    # annotation separately)
+    shapes = []
+    annotations = []
     
     # Add threshold bands if provided
     if threshold_bands:
         normal = threshold_bands.get('normal', 0)
         caution = threshold_bands.get('caution', 0)
+        max_val = _danger_band_top(values, caution)
         
-        # Normal band
-        fig.add_hrect(
-            y0=0, y1=normal,
-            fillcolor=THEME['status_normal'], opacity=0.08,
-            layer="below", line_width=0,
-            annotation_text="Normal", annotation_position="top left",
-            annotation_font_size=10, annotation_font_color=THEME['text_muted']
-        )
-        # Caution band
-        fig.add_hrect(
-            y0=normal, y1=caution,
-            fillcolor=THEME['status_caution'], opacity=0.08,
-            layer="below", line_width=0,
-            annotation_text="Caution", annotation_position="top left",
-            annotation_font_size=10, annotation_font_color=THEME['text_muted']
-        )
-        # Danger band
-        if len(values) > 0:
-            max_val = max(values) * 1.2
-        else:
-            max_val = caution * 1.5
-        fig.add_hrect(
-            y0=caution, y1=max_val,
-            fillcolor=THEME['status_danger'], opacity=0.08,
-            layer="below", line_width=0,
-            annotation_text="Danger", annotation_position="top left",
-            annotation_font_size=10, annotation_font_color=THEME['text_muted']
-        )
+        # Normal, caution and danger bands, each labelled at its top left
+        for y0, y1, fillcolor, label in ((0, normal, THEME['status_normal'], "Normal"),
+                                         (normal, caution, THEME['status_caution'], "Caution"),
+                                         (caution, max_val, THEME['status_danger'], "Danger")):
+            shapes.append({
+                'type': 'rect', 'xref': 'x domain', 'x0': 0, 'x1': 1, 'yref': 'y', 'y0': y0, 'y1': y1,
+                'fillcolor': fillcolor, 'opacity': 0.08, 'layer': 'below', 'line': {'width': 0}
+            })
+            annotations.append({
+                'text': label, 'showarrow': False,
+                'xref': 'x domain', 'x': 0, 'xanchor': 'left', 'yref': 'y', 'y': y1, 'yanchor': 'top',
+                'font': {'size': 10, 'color': THEME['text_muted']}
+            })
     
     # Add baseline line if provided
-    if baseline_value is not None and len(timestamps) > 0:
-        fig.add_hline(
-            y=baseline_value,
-            line_dash="dash",
-            line_color=THEME['text_muted'],
-            line_width=1,
-            opacity=0.5,
-            annotation_text=f"Baseline: {baseline_value:.3f}",
-            annotation_position="right",
-            annotation_font_size=10,
-            annotation_font_color=THEME['text_muted']
-        )
+    if baseline_value is not None:
+        shapes.append({
+            'type': 'line', 'xref': 'x domain', 'x0': 0, 'x1': 1,
+            'yref': 'y', 'y0': baseline_value, 'y1': baseline_value, 'opacity': 0.5,
+            'line': {'color': THEME['text_muted'], 'dash': 'dash', 'width': 1}
+        })
+        annotations.append({
+            'text': f"Baseline: {baseline_value:.3f}", 'showarrow': False,
+            'xref': 'x domain', 'x': 1, 'xanchor': 'left', 'yref': 'y', 'y': baseline_value, 'yanchor': 'middle',
+            'font': {'size': 10, 'color': THEME['text_muted']}
+        })
     
-    # Convert hex to rgba for fill
-    def hex_to_rgba(hex_color, alpha=0.2):
-        hex_color = hex_color.lstrip('#')
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return f'rgba({r}, {g}, {b}, {alpha})'
+    fig = go.Figure(layout={'shapes': shapes, 'annotations': annotations} if shapes else None)
     
     # Add main trace with gradient fill
     fig.add_trace(go.Scatter(
         x=timestamps,
         y=values,
         mode='lines',
-        line=dict(color=color, width=2.5, shape='spline'),
+        line={'color': color, 'width': 2.5, 'shape': 'spline'},
         fill='tozeroy',
-        fillcolor=hex_to_rgba(color, 0.15),
+        fillcolor=_hex_to_rgba(color, 0.15),
         name=ylabel,
         hovertemplate='<b>%{y:.4f}</b><br>Time: %{x:.1f}s<extra></extra>'
     ))
@@ -526,33 +609,54 @@ def render_time_series_plot(timestamps: np.ndarray, values: np.ndarray,
         xaxis_title="Time (seconds ago)",
         yaxis_title=ylabel,
         height=280,
-        margin=dict(l=50, r=20, t=50, b=50),
+        margin={'l': 50, 'r': 20, 't': 50, 'b': 50},
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Inter', 'color': THEME['text_secondary'], 'size': 12},
+        font=_CHART_FONT,
         hovermode='x unified',
         showlegend=False,
-        xaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor=THEME['chart_grid'],
-            zeroline=False,
-            showline=True,
-            linecolor=THEME['chart_axis'],
-            linewidth=1
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor=THEME['chart_grid'],
-            zeroline=False,
-            showline=True,
-            linecolor=THEME['chart_axis'],
-            linewidth=1
-        )
+        xaxis=_CHART_AXIS,
+        yaxis=_CHART_AXIS
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
+
+
+def render_time_series_sparkline(timestamps: np.ndarray, values: np.ndarray, title: str,
+                                 color: str = THEME['chart_vibration'], height: int = 80,
+                                 max_points: int = 300):
+    """
+    Render a non-interactive time series as an inline SVG polyline.
+    
+    A lightweight alternative to render_time_series_plot for small trend
+    lines: one st.markdown element with no Plotly figure (no hover, axes or
+    threshold bands).
+    
+    Args:
+        timestamps: Sample times (any monotonic scale, e.g. seconds ago)
+        values: Sample values
+        title: Label shown above the line
+        color: Line color
+        height: Height in pixels (the line stretches to the column width)
+        max_points: Series are reduced to about this many points
+    """
+    width = 1000  # viewBox units; scaled to the column width
+    
+    timestamps, values = downsample_minmax(timestamps, values, max_points)
+    points = ""
+    if len(values) > 1:
+        t_min, t_max = float(timestamps.min()), float(timestamps.max())
+        v_min, v_max = float(values.min()), float(values.max())
+        xs = (timestamps - t_min) * (width / (t_max - t_min)) if t_max > t_min else np.zeros(len(values))
+        if v_max > v_min:
+            ys = height - 2 - (values - v_min) * ((height - 4) / (v_max - v_min))
+        else:
+            ys = np.full(len(values), height / 2)  # Flat series: line through the middle
+        points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs.tolist(), ys.tolist()))
+    
+    svg_html = f'<div class="metric-label">{title}</div><svg viewBox="0 0 {width} {height}" preserveAspectRatio="none" style="width: 100%; height: {height}px;"><polyline fill="none" stroke="{color}" stroke-width="2" vector-effect="non-scaling-stroke" points="{points}"/></svg>'
+    
+    st.markdown(svg_html, unsafe_allow_html=True)
 
 
 def render_metric_card(label: str, value: str, unit: str, trend: Optional[str] = None, color: str = None, help_text: str = None):
@@ -575,44 +679,85 @@ def render_metric_card(label: str, value: str, unit: str, trend: Optional[str] =
 def render_metric_row(metrics: List[Dict[str, Any]]):
     """
     Render a row of premium metric cards.
+    
+    The cards go out as one CSS grid in a single st.markdown call (see
+    render_metric_rows) instead of an st.columns block with one markdown
+    element per card.
+    """
+    # help_text argument removed as icons were not rendering reliably
+    render_metric_rows([[
+        (metric['label'], metric['value'], metric.get('unit', ''),
+         metric.get('trend', None), metric.get('color', None), None)
+        for metric in metrics
+    ]])
+
+
+def render_metric_rows(rows: List[List[Tuple[str, str, str, Optional[str], Optional[str], Optional[str]]]]):
     """
-    cols = st.columns(len(metrics))
+    Render several rows of premium metric cards as a single element.
     
-    for col, metric in zip(cols, metrics):
-        with col:
-            trend = metric.get('trend', None)
-            color = metric.get('color', None)
-            # help_text argument removed as icons were not rendering reliably
-            card_html = render_metric_card(
-                metric['label'],
-                metric['value'],
-                metric.get('unit', ''),
-                trend,
-                color
-            )
-            st.markdown(card_html, unsafe_allow_html=True)
+    Each metric is a (label, value, unit, trend, color, help) tuple. The rows
+    are laid out as CSS grids inside one st.markdown call instead of an
+    st.columns block plus one markdown element per card.
+    """
+    row_html = []
+    for row in rows:
+        # help text is not rendered, as in render_metric_row
+        cards = "".join(
+            render_metric_card(label, value, unit, trend, color)
+            for label, value, unit, trend, color, _help in row
+        )
+        row_html.append(f'<div style="display: grid; grid-template-columns: repeat({len(row)}, minmax(0, 1fr)); gap: 1rem;">{cards}</div>')
+    
+    st.markdown("<br>".join(row_html), unsafe_allow_html=True)
 
 
-def render_3d_vibration_plot(ax: np.ndarray, ay: np.ndarray, az: np.ndarray, color: str = THEME['chart_vibration']):
+def render_3d_vibration_plot(ax: np.ndarray, ay: np.ndarray, az: np.ndarray, color: str = THEME['chart_vibration'],
+                             min_refresh: float = 0.0):
     """
     Render 3D vibration vector visualization.
+    
+    The WebGL scene is the most expensive chart to redraw, so with
+    min_refresh > 0 the figure is rebuilt at most once per min_refresh
+    seconds; in between, the unchanged figure is re-sent, so the scene is
+    not re-uploaded with new data on every refresh.
+    
+    The figure itself is built once (and again only if the color changes);
+    a refresh moves the vector's end point in place.
     """
     if len(ax) == 0:
         return
     
-    # Get latest values
-    latest_ax = ax[-1] if len(ax) > 0 else 0
-    latest_ay = ay[-1] if len(ay) > 0 else 0
-    latest_az = az[-1] if len(az) > 0 else 0
+    now = time.monotonic()
+    cached = st.session_state.get('_vibration_3d_figure')
+    if cached is None or cached[2] != color:
+        fig = _build_3d_vibration_figure(float(ax[-1]), float(ay[-1]), float(az[-1]), color)
+        st.session_state['_vibration_3d_figure'] = (now, fig, color)
+    elif now - cached[0] >= min_refresh:
+        fig = cached[1]
+        with fig.batch_update():
+            fig.data[0].x = [0, float(ax[-1])]
+            fig.data[0].y = [0, float(ay[-1])]
+            fig.data[0].z = [0, float(az[-1])]
+        st.session_state['_vibration_3d_figure'] = (now, fig, color)
+    else:
+        fig = cached[1]
     
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+
+def _build_3d_vibration_figure(latest_ax: float, latest_ay: float, latest_az: float, color: str) -> go.Figure:
+    """
+    Build the 3D vibration vector figure for the latest sample.
+    """
     # Create 3D scatter plot
     fig = go.Figure(data=go.Scatter3d(
         x=[0, latest_ax],
         y=[0, latest_ay],
         z=[0, latest_az],
         mode='lines+markers',
-        line=dict(color=color, width=8),
-        marker=dict(size=8, color=color),
+        line={'color': color, 'width': 8},
+        marker={'size': 8, 'color': color},
         hovertemplate='X: %{x:.3f}<br>Y: %{y:.3f}<br>Z: %{z:.3f}<extra></extra>'
     ))
     
@@ -621,36 +766,36 @@ def render_3d_vibration_plot(ax: np.ndarray, ay: np.ndarray, az: np.ndarray, col
             'text': '3D Vibration Vector',
             'font': {'size': 14, 'family': 'Inter', 'color': THEME['text_primary']}
         },
-        scene=dict(
-            xaxis=dict(
-                title='X (g)',
-                backgroundcolor=THEME['bg_card'],
-                gridcolor=THEME['chart_grid'],
-                showbackground=True,
-                color=THEME['text_secondary']
-            ),
-            yaxis=dict(
-                title='Y (g)',
-                backgroundcolor=THEME['bg_card'],
-                gridcolor=THEME['chart_grid'],
-                showbackground=True,
-                color=THEME['text_secondary']
-            ),
-            zaxis=dict(
-                title='Z (g)',
-                backgroundcolor=THEME['bg_card'],
-                gridcolor=THEME['chart_grid'],
-                showbackground=True,
-                color=THEME['text_secondary']
-            ),
-            bgcolor=THEME['bg_primary']
-        ),
+        scene={
+            'xaxis': {
+                'title': 'X (g)',
+                'backgroundcolor': THEME['bg_card'],
+                'gridcolor': THEME['chart_grid'],
+                'showbackground': True,
+                'color': THEME['text_secondary']
+            },
+            'yaxis': {
+                'title': 'Y (g)',
+                'backgroundcolor': THEME['bg_card'],
+                'gridcolor': THEME['chart_grid'],
+                'showbackground': True,
+                'color': THEME['text_secondary']
+            },
+            'zaxis': {
+                'title': 'Z (g)',
+                'backgroundcolor': THEME['bg_card'],
+                'gridcolor': THEME['chart_grid'],
+                'showbackground': True,
+                'color': THEME['text_secondary']
+            },
+            'bgcolor': THEME['bg_primary']
+        },
         height=300,
-        margin=dict(l=0, r=0, t=40, b=0),
+        margin={'l': 0, 'r': 0, 't': 40, 'b': 0},
         paper_bgcolor='rgba(0,0,0,0)'
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
 
 
 def render_diagnostics_panel(stats: Dict[str, Any]):
@@ -676,7 +821,7 @@ def render_diagnostics_panel(stats: Dict[str, Any]):
         
         metrics = [
             {'label': 'Status', 'value': status_emoji, 'unit': '', 'color': status_color},
-            {'label': 'Port', 'value': stats.get('port', 'N/A')[:8], 'unit': '', 'color': None},
+            {'label': 'Port', 'value': (stats.get('port') or 'N/A')[:8], 'unit': '', 'color': None},
             {'label': 'Packet Rate', 'value': f"{fps:.1f}", 'unit': ' Hz', 'color': None},
             {'label': 'Errors', 'value': f"{stats.get('error_count', 0)}", 'unit': '', 'color': THEME['status_danger'] if stats.get('error_count', 0) > 0 else None}
         ]
@@ -704,22 +849,21 @@ def render_section_title(title: str, subtitle: str = None):
     st.markdown(title_html, unsafe_allow_html=True)
 
 
-def render_histogram_plot(values: np.ndarray, title: str, xlabel: str, 
-                         color: str = THEME['chart_vibration'], 
-                         baseline_value: float = None):
+def _build_histogram_figure(values: np.ndarray, title: str, xlabel: str, color: str,
+                            baseline_value: float, bin_edges: np.ndarray) -> go.Figure:
     """
-    Render premium dark-themed histogram plot.
+    Build the histogram figure (see render_histogram_plot).
     """
-    if len(values) == 0:
-        st.info("No data available for histogram")
-        return
-    
     fig = go.Figure()
     
-    # Create histogram
-    fig.add_trace(go.Histogram(
-        x=values,
-        nbinsx=30,
+    # Create histogram: binned here, so only the bars are sent to the browser
+    if bin_edges is None:
+        bin_edges = np.histogram_bin_edges(values, bins=30)
+    counts, _ = np.histogram(values, bins=bin_edges)
+    fig.add_trace(go.Bar(
+        x=(bin_edges[:-1] + bin_edges[1:]) * 0.5,
+        y=counts,
+        width=np.diff(bin_edges),
         marker_color=color,
         marker_line_color=THEME['bg_card'],
         marker_line_width=1,
@@ -753,58 +897,103 @@ def render_histogram_plot(values: np.ndarray, title: str, xlabel: str,
         xaxis_title=xlabel,
         yaxis_title="Frequency",
         height=280,
-        margin=dict(l=50, r=20, t=50, b=50),
+        margin={'l': 50, 'r': 20, 't': 50, 'b': 50},
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Inter', 'color': THEME['text_secondary'], 'size': 12},
+        font=_CHART_FONT,
         showlegend=False,
-        xaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor=THEME['chart_grid'],
-            zeroline=False,
-            showline=True,
-            linecolor=THEME['chart_axis'],
-            linewidth=1
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor=THEME['chart_grid'],
-            zeroline=False,
-            showline=True,
-            linecolor=THEME['chart_axis'],
-            linewidth=1
-        )
+        xaxis=_CHART_AXIS,
+        yaxis=_CHART_AXIS
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
 
 
-def render_box_plot(values: np.ndarray, title: str, ylabel: str,
-                   color: str = THEME['chart_vibration'],
-                   baseline_value: float = None):
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_histogram_figure(signature: int, _values: np.ndarray, title: str, xlabel: str, color: str,
+                             baseline_value: float, _bin_edges: np.ndarray) -> go.Figure:
     """
-    Render premium dark-themed box plot.
+    Build the histogram figure once per data-window signature (values not hashed).
+    """
+    return _build_histogram_figure(_values, title, xlabel, color, baseline_value, _bin_edges)
+
+
+def render_histogram_plot(values: np.ndarray, title: str, xlabel: str, 
+                         color: str = THEME['chart_vibration'], 
+                         baseline_value: float = None,
+                         bin_edges: np.ndarray = None,
+                         signature: int = None):
+    """
+    Render premium dark-themed histogram plot.
+    
+    The counts are binned here (into bin_edges, or 30 equal bins over the
+    data range) and only the bars are sent to the browser, instead of every
+    sample for Plotly to bin client-side.
+    With a signature (a hash identifying the data window) the figure is
+    cached, so unchanged windows skip binning and figure construction.
     """
     if len(values) == 0:
-        st.info("No data available for box plot")
+        st.info("No data available for histogram")
         return
     
+    if signature is not None:
+        fig = _cached_histogram_figure(signature, values, title, xlabel, color, baseline_value, bin_edges)
+    else:
+        fig = _build_histogram_figure(values, title, xlabel, color, baseline_value, bin_edges)
+    
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+
+def _build_box_figure(values: np.ndarray, title: str, ylabel: str, color: str,
+                      baseline_value: float) -> go.Figure:
+    """
+    Build the box figure (see render_box_plot).
+    """
     fig = go.Figure()
     
+    # Box statistics are computed here, so the browser gets a few numbers
+    # (plus the outliers) instead of every sample. Quartiles use linear
+    # interpolation and whiskers end at the furthest samples within 1.5 IQR,
+    # as Plotly computes them. The quartiles come from one partition and
+    # mean/std from one pass (the shared utils helpers)
+    quartiles = compute_percentiles(values, [25, 50, 75])
+    q1, median, q3 = quartiles['p25'], quartiles['p50'], quartiles['p75']
+    _, _, mean, std = min_max_moments(values)
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    whiskers = values[inside]
+    outliers = values[~inside]
+    
     # Create box plot
     fig.add_trace(go.Box(
-        y=values,
+        q1=[q1],
+        median=[median],
+        q3=[q3],
+        lowerfence=[float(whiskers.min())],
+        upperfence=[float(whiskers.max())],
+        mean=[mean],
+        sd=[std],
+        x=[ylabel],
         name=ylabel,
         marker_color=color,
         line_color=color,
         fillcolor=color,
         opacity=0.6,
-        boxmean='sd',  # Show mean and standard deviation
-        hovertemplate='<b>%{y:.4f}</b><extra></extra>'
+        boxmean='sd'  # Show mean and standard deviation
     ))
     
+    # Outliers as their own markers, as the box would draw them from raw samples
+    if len(outliers) > 0:
+        fig.add_trace(go.Scatter(
+            x=[ylabel] * len(outliers),
+            y=outliers,
+            mode='markers',
+            marker_color=color,
+            opacity=0.6,
+            name=ylabel,
+            hovertemplate='<b>%{y:.4f}</b><extra></extra>'
+        ))
+    
     # Add baseline line if provided
     if baseline_value is not None:
         fig.add_hline(
@@ -829,22 +1018,45 @@ def render_box_plot(values: np.ndarray, title: str, ylabel: str,
         },
         yaxis_title=ylabel,
         height=280,
-        margin=dict(l=50, r=20, t=50, b=50),
+        margin={'l': 50, 'r': 20, 't': 50, 'b': 50},
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Inter', 'color': THEME['text_secondary'], 'size': 12},
+        font=_CHART_FONT,
         showlegend=False,
-        yaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor=THEME['chart_grid'],
-            zeroline=False,
-            showline=True,
-            linecolor=THEME['chart_axis'],
-            linewidth=1
-        )
+        yaxis=_CHART_AXIS
     )
     
+    return fig
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_box_figure(signature: int, _values: np.ndarray, title: str, ylabel: str, color: str,
+                       baseline_value: float) -> go.Figure:
+    """
+    Build the box figure once per data-window signature (values not hashed).
+    """
+    return _build_box_figure(_values, title, ylabel, color, baseline_value)
+
+
+def render_box_plot(values: np.ndarray, title: str, ylabel: str,
+                   color: str = THEME['chart_vibration'],
+                   baseline_value: float = None,
+                   signature: int = None):
+    """
+    Render premium dark-themed box plot.
+    
+    With a signature (a hash identifying the data window) the figure is
+    cached, so unchanged windows skip the figure construction.
+    """
+    if len(values) == 0:
+        st.info("No data available for box plot")
+        return
+    
+    if signature is not None:
+        fig = _cached_box_figure(signature, values, title, ylabel, color, baseline_value)
+    else:
+        fig = _build_box_figure(values, title, ylabel, color, baseline_value)
+    
     st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
 
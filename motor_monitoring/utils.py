@@ -1,9 +1,11 @@
 """
 Utility functions for motor monitoring system
 """
+import math
+import time
+from functools import lru_cache
 import numpy as np
-from typing import Tuple, Dict, Any
-from datetime import datetime
+from typing import Tuple, Dict, Any, Optional
 
 
 def compute_vibration_magnitude(ax: float, ay: float, az: float) -> float:
@@ -16,20 +18,63 @@ def compute_vibration_magnitude(ax: float, ay: float, az: float) -> float:
     Returns:
         Magnitude in g
     """
-    return np.sqrt(ax**2 + ay**2 + az**2)
+    # math.sqrt on Python floats skips NumPy's ufunc dispatch for 3 numbers
+    return math.sqrt(ax * ax + ay * ay + az * az)
 
 
-def compute_vibration_magnitude_array(ax: np.ndarray, ay: np.ndarray, az: np.ndarray) -> np.ndarray:
+def compute_vibration_magnitude_array(ax: np.ndarray, ay: np.ndarray, az: np.ndarray,
+                                      out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Compute vibration magnitude from 3-axis accelerometer arrays.
     
+    The squares are summed and square-rooted in place in the result array,
+    so only the ay/az squares are temporary.
+    
     Args:
         ax, ay, az: Arrays of acceleration values in g
+        out: Optional preallocated array (same length) to write the result into
         
     Returns:
         Array of magnitudes in g
     """
-    return np.sqrt(ax**2 + ay**2 + az**2)
+    if out is None:
+        # Float result even for integer input (np.multiply would keep the
+        # integer dtype and the in-place sqrt would fail)
+        out = np.empty(np.shape(ax), dtype=np.result_type(ax, ay, az, np.float32))
+    mag = np.multiply(ax, ax, out=out)
+    mag += ay * ay
+    mag += az * az
+    return np.sqrt(mag, out=mag)
+
+
+def compute_vibration_stats(ax: np.ndarray, ay: np.ndarray, az: np.ndarray,
+                            out: Optional[np.ndarray] = None) -> Tuple[float, float, float]:
+    """
+    Compute mean, standard deviation and max of the vibration magnitude.
+    
+    The magnitude is built in one array, which is then reused for the
+    deviations in the std, instead of separate np.mean/np.std/np.max calls
+    (np.std allocates its own deviation array).
+    
+    Args:
+        ax, ay, az: Arrays of acceleration values in g (same length, non-empty)
+        out: Optional preallocated scratch array (same length); its contents
+            are overwritten
+    
+    Returns:
+        Tuple of (mean, std, max) in g
+    """
+    mag = compute_vibration_magnitude_array(ax, ay, az, out=out)
+    
+    vib_max = float(mag.max())
+    vib_mean = float(mag.mean())
+    
+    # Two-pass std (deviations from the mean) stays accurate even though the
+    # magnitude sits near 1 g with a tiny spread
+    mag -= vib_mean
+    vib_std = float(np.sqrt(np.dot(mag, mag) / mag.size))
+    
+    return vib_mean, vib_std, vib_max
 
 
 def compute_temperature_slope(temps: np.ndarray, timestamps: np.ndarray) -> float:
@@ -46,16 +91,48 @@ def compute_temperature_slope(temps: np.ndarray, timestamps: np.ndarray) -> floa
     if len(temps) < 2:
         return 0.0
     
-    # Normalize timestamps to start from 0
-    t = timestamps - timestamps[0]
+    # Normalize timestamps to start from 0 (in float, so integer timestamps
+    # work too), then center them on the window
+    t = np.subtract(timestamps, timestamps[0], dtype=np.float64)
+    t -= t.mean()
     
-    # Simple linear regression
-    if len(t) > 1 and np.std(t) > 0:
-        slope = np.polyfit(t, temps, 1)[0]
-        return slope
+    # Simple linear regression in closed form: slope = Σ(t·T) / Σ(t²) on
+    # centered time (np.polyfit builds a Vandermonde matrix and runs an SVD)
+    stt = float(np.dot(t, t))
+    if stt > 0:
+        return float(np.dot(t, temps)) / stt
     return 0.0
 
 
+def compute_temperature_stats(temps: np.ndarray, timestamps: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Compute temperature mean, standard deviation and slope together.
+    
+    The deviations from the mean are computed once and shared by the std
+    and the least-squares slope, which is the closed form
+    sum(dt * dtemp) / sum(dt * dt) on centered time and temperature.
+    
+    Args:
+        temps: Array of temperatures in °C (non-empty)
+        timestamps: Array of timestamps in seconds (same length)
+        
+    Returns:
+        Tuple of (mean in °C, std in °C, slope in °C/s)
+    """
+    temp_mean = float(temps.mean())
+    dtemp = temps - temp_mean
+    temp_std = float(np.sqrt(np.dot(dtemp, dtemp) / dtemp.size))
+    
+    # Center time on the window (also keeps epoch-sized values out of the sums);
+    # computed in float so integer timestamps work too
+    t = np.subtract(timestamps, timestamps[0], dtype=np.float64)
+    t -= t.mean()
+    stt = float(np.dot(t, t))
+    temp_slope = float(np.dot(t, dtemp)) / stt if stt > 0 else 0.0
+    
+    return temp_mean, temp_std, temp_slope
+
+
 def compute_z_score(value: float, baseline_mean: float, baseline_std: float) -> float:
     """
     Compute z-score deviation from baseline.
@@ -73,6 +150,30 @@ def compute_z_score(value: float, baseline_mean: float, baseline_std: float) ->
     return (value - baseline_mean) / baseline_std
 
 
+def compute_z_score_array(values: np.ndarray, baseline_mean, baseline_std,
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute z-scores for arrays of values (vectorized compute_z_score).
+    
+    Baseline mean and std broadcast against the values, so they can be
+    scalars or per-channel arrays. A zero std gives a z-score of 0.
+    
+    Args:
+        values: Array of current values (floating point)
+        baseline_mean: Baseline mean (scalar or array)
+        baseline_std: Baseline standard deviation (scalar or array)
+        out: Optional preallocated float array (same shape) to write the result into
+        
+    Returns:
+        Array of z-scores
+    """
+    z = np.subtract(values, baseline_mean, out=out)
+    has_std = np.asarray(baseline_std) != 0
+    np.divide(z, baseline_std, out=z, where=has_std)
+    np.copyto(z, 0.0, where=~has_std)
+    return z
+
+
 def health_score_from_z(z_score: float, threshold_caution: float = 2.0, threshold_danger: float = 3.0) -> float:
     """
     Convert z-score to health score (0-100).
@@ -100,6 +201,37 @@ def health_score_from_z(z_score: float, threshold_caution: float = 2.0, threshol
         return max(0.0, 30.0 - progress * 30.0)
 
 
+def health_score_from_z_array(z_scores: np.ndarray, threshold_caution: float = 2.0,
+                             threshold_danger: float = 3.0) -> np.ndarray:
+    """
+    Convert an array of z-scores to health scores (vectorized health_score_from_z).
+    
+    Args:
+        z_scores: Array of z-scores
+        threshold_caution: Z-score threshold for caution state
+        threshold_danger: Z-score threshold for danger state
+        
+    Returns:
+        Array of health scores from 0 (critical) to 100 (perfect)
+    """
+    # Each piece is only selected inside its own range, where it already
+    # stays within its band, so the scalar version's max() clamps are not needed
+    z_abs = np.abs(z_scores)
+    normal = 100.0 - z_abs * (30.0 / threshold_caution)
+    caution = 70.0 - (z_abs - threshold_caution) * (40.0 / (threshold_danger - threshold_caution))
+    danger = 30.0 - np.minimum(1.0, (z_abs - threshold_danger) / threshold_danger) * 30.0
+    return np.where(z_abs <= threshold_caution, normal, np.where(z_abs <= threshold_danger, caution, danger))
+
+
+# (state_label, color_code) by state code: 0 = Danger, 1 = Caution, 2 = Normal
+# Use theme colors (will be imported from ui_components if needed)
+HEALTH_STATES = (
+    ("Danger", "#FF3366"),  # Premium danger red
+    ("Caution", "#FFB800"),  # Premium warning amber
+    ("Normal", "#00FF88")  # Premium success green
+)
+
+
 def get_state_from_health(health_score: float) -> Tuple[str, str]:
     """
     Get state label and color from health score.
@@ -110,13 +242,46 @@ def get_state_from_health(health_score: float) -> Tuple[str, str]:
     Returns:
         Tuple of (state_label, color_code)
     """
-    # Use theme colors (will be imported from ui_components if needed)
     if health_score >= 70:
-        return "Normal", "#00FF88"  # Premium success green
+        return HEALTH_STATES[2]
     elif health_score >= 30:
-        return "Caution", "#FFB800"  # Premium warning amber
+        return HEALTH_STATES[1]
     else:
-        return "Danger", "#FF3366"  # Premium danger red
+        return HEALTH_STATES[0]
+
+
+def get_state_from_health_array(health_scores: np.ndarray) -> np.ndarray:
+    """
+    Get state codes for an array of health scores (vectorized
+    get_state_from_health).
+    
+    Comparisons are False for NaN, so NaN maps to Danger as in the scalar
+    version (np.digitize would put it past the last edge, in Normal).
+    
+    Args:
+        health_scores: Array of health scores (0-100)
+        
+    Returns:
+        Array of state codes indexing HEALTH_STATES (0 = Danger,
+        1 = Caution, 2 = Normal)
+    """
+    health_scores = np.asarray(health_scores)
+    return (health_scores >= 30).astype(np.intp) + (health_scores >= 70)
+
+
+@lru_cache(maxsize=64)
+def _format_whole_seconds(seconds: int) -> str:
+    """
+    Format a whole-second Unix timestamp (cached, so repeated calls within
+    the same second are a dictionary lookup).
+    
+    Args:
+        seconds: Unix timestamp truncated to whole seconds
+        
+    Returns:
+        Formatted datetime string
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
 
 
 def format_timestamp(timestamp: float) -> str:
@@ -129,7 +294,8 @@ def format_timestamp(timestamp: float) -> str:
     Returns:
         Formatted datetime string
     """
-    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    # The format has whole-second resolution, so cache on the second
+    return _format_whole_seconds(math.floor(timestamp))
 
 
 def validate_sensor_data(ax: float, ay: float, az: float, temp: float) -> bool:
@@ -143,12 +309,10 @@ def validate_sensor_data(ax: float, ay: float, az: float, temp: float) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    # Check for NaN or infinite values
-    if not all(np.isfinite([ax, ay, az, temp])):
-        return False
-    
+    # Plain chained comparisons: this runs once per serial packet, and range
+    # comparisons are False for NaN/inf, so they also reject non-finite values
     # Reasonable acceleration range: -50g to +50g
-    if not all(-50 <= val <= 50 for val in [ax, ay, az]):
+    if not (-50 <= ax <= 50 and -50 <= ay <= 50 and -50 <= az <= 50):
         return False
     
     # Reasonable temperature range: -40°C to +150°C
@@ -158,10 +322,61 @@ def validate_sensor_data(ax: float, ay: float, az: float, temp: float) -> bool:
     return True
 
 
+def validate_sensor_batch(ax: np.ndarray, ay: np.ndarray, az: np.ndarray,
+                          temp: np.ndarray) -> np.ndarray:
+    """
+    Validate arrays of sensor data for reasonable ranges (vectorized
+    validate_sensor_data).
+    
+    Args:
+        ax, ay, az: Arrays of acceleration values in g
+        temp: Array of temperatures in °C
+        
+    Returns:
+        Boolean mask, True where the sample is valid
+    """
+    # Range comparisons are False for NaN/inf, so they also reject non-finite values
+    # Reasonable acceleration range: -50g to +50g
+    valid = np.abs(ax) <= 50
+    valid &= np.abs(ay) <= 50
+    valid &= np.abs(az) <= 50
+    
+    # Reasonable temperature range: -40°C to +150°C
+    valid &= temp >= -40
+    valid &= temp <= 150
+    
+    return valid
+
+
+# Smallest smooth_data window for which the cumulative-sum filter beats
+# np.convolve (measured; np.convolve is faster for short kernels)
+_CUMSUM_MIN_WINDOW = 12
+
+
+@lru_cache(maxsize=16)
+def _box_kernel(window_size: int) -> np.ndarray:
+    """
+    Get the moving average kernel for a window size (cached and read-only,
+    so repeated smooth_data calls do not allocate it again).
+    
+    Args:
+        window_size: Size of smoothing window
+        
+    Returns:
+        Kernel array of window_size equal weights summing to 1
+    """
+    kernel = np.ones(window_size) / window_size
+    kernel.flags.writeable = False
+    return kernel
+
+
 def smooth_data(data: np.ndarray, window_size: int = 5) -> np.ndarray:
     """
     Apply moving average smoothing to data.
     
+    Long windows use a cumulative-sum box filter, which is O(N) whatever the
+    window; both paths match np.convolve(mode='same') with zero padding.
+    
     Args:
         data: Input data array
         window_size: Size of smoothing window
@@ -169,26 +384,101 @@ def smooth_data(data: np.ndarray, window_size: int = 5) -> np.ndarray:
     Returns:
         Smoothed data array
     """
-    if len(data) < window_size:
+    n = len(data)
+    if n < window_size:
         return data
     
-    kernel = np.ones(window_size) / window_size
-    return np.convolve(data, kernel, mode='same')
+    if window_size < _CUMSUM_MIN_WINDOW:
+        return np.convolve(data, _box_kernel(window_size), mode='same')
+    
+    # Running sum of the zero-padded data, laid out so that every window
+    # (centered as in np.convolve) is the difference of two entries
+    offset = window_size // 2
+    csum = np.zeros(n + window_size)
+    np.cumsum(data, out=csum[offset + 1:offset + 1 + n])
+    csum[offset + 1 + n:] = csum[offset + n]
+    
+    return (csum[window_size:] - csum[:n]) / window_size
+
+
+def downsample_minmax(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series for plotting, keeping the minimum and maximum of each bucket.
+    
+    Spikes and dips survive (unlike plain decimation), so the plotted shape and
+    the overall extremes are unchanged. Points keep their original order.
+    
+    Args:
+        x: Sample positions (e.g., timestamps)
+        y: Sample values
+        max_points: Largest number of points to return (about)
+    
+    Returns:
+        Tuple of (x, y); the inputs themselves if they already fit
+    """
+    n = len(y)
+    buckets = max(max_points // 2 - 1, 1)
+    if n <= max_points or n <= 2 * buckets:
+        return x, y
+    
+    # Equal-sized buckets; the last one is padded with its final value
+    size = -(-n // buckets)
+    padded = np.pad(y, (0, buckets * size - n), mode='edge').reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    
+    # First and last points anchor the ends of the series
+    index = np.concatenate((
+        [0],
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+        [n - 1]
+    ))
+    index = np.unique(np.minimum(index, n - 1))  # Sorted, without duplicates
+    
+    return x[index], y[index]
 
 
 def compute_rms(data: np.ndarray) -> float:
     """
     Compute Root Mean Square (RMS) value.
     
+    The sum of squares is a single np.dot, without the data**2 temporary.
+    
     Args:
         data: Input data array
         
     Returns:
         RMS value
     """
-    if len(data) == 0:
+    n = len(data)
+    if n == 0:
         return 0.0
-    return np.sqrt(np.mean(data**2))
+    return float(np.sqrt(np.dot(data, data) / n))
+
+
+def _mean_std(data: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute mean and standard deviation from one sum and one np.dot, instead
+    of np.mean plus np.std (which takes the mean again and allocates the
+    deviations).
+    
+    The data is shifted by its first value first, which keeps the one-pass
+    variance accurate for values with a large offset and a small spread
+    (e.g. temperatures).
+    
+    Args:
+        data: Non-empty input data array
+        
+    Returns:
+        Tuple of (mean, std)
+    """
+    data = np.asarray(data)
+    n = len(data)
+    shift = float(data[0])
+    d = data - shift
+    mean_d = float(d.sum()) / n
+    var = max(float(np.dot(d, d)) / n - mean_d * mean_d, 0.0)
+    return mean_d + shift, math.sqrt(var)
 
 
 def compute_coefficient_of_variation(data: np.ndarray) -> float:
@@ -203,10 +493,54 @@ def compute_coefficient_of_variation(data: np.ndarray) -> float:
     """
     if len(data) == 0:
         return 0.0
-    mean = np.mean(data)
+    mean, std = _mean_std(data)
     if mean == 0:
         return 0.0
-    return (np.std(data) / mean) * 100.0
+    return (std / mean) * 100.0
+
+
+def min_max_moments(data: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Compute min, max, mean and standard deviation together.
+    
+    Mean and std come from the one-pass shifted sums of _mean_std.
+    
+    Args:
+        data: Input data array
+        
+    Returns:
+        Tuple of (min, max, mean, std), all 0.0 for empty input
+    """
+    data = np.asarray(data)
+    n = len(data)
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0
+    
+    mean, std = _mean_std(data)
+    
+    return float(data.min()), float(data.max()), mean, std
+
+
+def _partition_percentiles(data: np.ndarray, percentiles) -> np.ndarray:
+    """
+    Compute linearly interpolated percentiles (as np.percentile) with a single
+    np.partition around the needed ranks, without np.percentile's overhead.
+    
+    Args:
+        data: Non-empty input data array
+        percentiles: Sequence of percentile values (0-100)
+        
+    Returns:
+        Array of percentile values
+    """
+    n = len(data)
+    pos = np.asarray(percentiles, dtype=float) * ((n - 1) / 100.0)
+    lo = pos.astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    
+    part = np.partition(data, np.union1d(lo, hi))
+    below = part[lo]
+    return below + (pos - lo) * (part[hi] - below)
 
 
 def compute_percentiles(data: np.ndarray, percentiles: list = [25, 50, 75, 95]) -> Dict[str, float]:
@@ -223,8 +557,8 @@ def compute_percentiles(data: np.ndarray, percentiles: list = [25, 50, 75, 95])
     if len(data) == 0:
         return {f'p{p}': 0.0 for p in percentiles}
     
-    computed = np.percentile(data, percentiles)
-    return {f'p{p}': float(computed[i]) for i, p in enumerate(percentiles)}
+    computed = _partition_percentiles(data, percentiles)
+    return dict(zip([f'p{p}' for p in percentiles], computed.tolist()))
 
 
 def compute_peak_to_peak(data: np.ndarray) -> float:
@@ -239,7 +573,10 @@ def compute_peak_to_peak(data: np.ndarray) -> float:
     """
     if len(data) == 0:
         return 0.0
-    return float(np.max(data) - np.min(data))
+    # ndarray methods skip the np.max/np.min wrapper dispatch (np.ptp is
+    # itself max - min, two reductions, behind a slower wrapper)
+    data = np.asarray(data)
+    return float(data.max() - data.min())
 
 
 def compute_skewness(data: np.ndarray) -> float:
@@ -254,11 +591,7 @@ def compute_skewness(data: np.ndarray) -> float:
     """
     if len(data) < 3:
         return 0.0
-    mean = np.mean(data)
-    std = np.std(data)
-    if std == 0:
-        return 0.0
-    return float(np.mean(((data - mean) / std) ** 3))
+    return compute_moments(data)['skewness']
 
 
 def compute_kurtosis(data: np.ndarray) -> float:
@@ -273,9 +606,109 @@ def compute_kurtosis(data: np.ndarray) -> float:
     """
     if len(data) < 4:
         return 0.0
-    mean = np.mean(data)
-    std = np.std(data)
-    if std == 0:
-        return 0.0
-    return float(np.mean(((data - mean) / std) ** 4) - 3.0)
+    return compute_moments(data)['kurtosis']
+
+
+def compute_central_moments(data: np.ndarray, mean: float) -> Tuple[float, float, float]:
+    """
+    Compute the 2nd, 3rd and 4th central moments together.
+    
+    The deviations and their squares are built once and shared, so skewness
+    (m3 / m2**1.5) and excess kurtosis (m4 / m2**2 - 3) both come from one
+    pass instead of separate (x - mean)**k reductions.
+    
+    Args:
+        data: Non-empty input data array
+        mean: Mean of data
+        
+    Returns:
+        Tuple of (m2, m3, m4)
+    """
+    n = len(data)
+    d = data - mean
+    d2 = d * d
+    return float(d2.sum()) / n, float(np.dot(d2, d)) / n, float(np.dot(d2, d2)) / n
+
+
+def compute_moments(data: np.ndarray) -> Dict[str, float]:
+    """
+    Compute the moment-based statistics of data together.
+    
+    Mean, std, RMS, CV, skewness and kurtosis all follow from the mean and
+    one compute_central_moments pass (RMS**2 = mean**2 + m2), instead of each
+    compute_* helper recomputing the mean and std on its own.
+    
+    Args:
+        data: Input data array
+        
+    Returns:
+        Dictionary with mean, std, rms, cv, skewness and kurtosis (all 0.0
+        for empty input; skewness/kurtosis 0.0 below 3/4 samples or for
+        constant data)
+    """
+    data = np.asarray(data)
+    n = len(data)
+    if n == 0:
+        return dict.fromkeys(('mean', 'std', 'rms', 'cv', 'skewness', 'kurtosis'), 0.0)
+    
+    mean = float(data.mean())
+    m2, m3, m4 = compute_central_moments(data, mean)
+    std = float(np.sqrt(m2))
+    
+    return {
+        'mean': mean,
+        'std': std,
+        'rms': float(np.sqrt(mean * mean + m2)),
+        'cv': (std / mean) * 100.0 if mean != 0 else 0.0,
+        'skewness': m3 / m2 ** 1.5 if n >= 3 and m2 > 0 else 0.0,
+        'kurtosis': m4 / (m2 * m2) - 3.0 if n >= 4 and m2 > 0 else 0.0
+    }
+
+
+# Result of compute_all_vib_stats for an empty window (copied, never returned as is)
+_EMPTY_VIB_STATS = {key: 0.0 for key in ('mean', 'std', 'rms', 'cv', 'min', 'max', 'peak_to_peak',
+                                         'skewness', 'kurtosis', 'p25', 'p50', 'p75', 'p95')}
+
+
+def compute_all_vib_stats(vib_mag: np.ndarray) -> Dict[str, float]:
+    """
+    Compute the full set of vibration magnitude statistics together.
+    
+    The std, RMS, CV, skewness and kurtosis come from one compute_moments
+    pass over the deviations, and all percentiles come from a single
+    np.partition, instead of one pass per compute_* helper.
+    
+    Args:
+        vib_mag: Array of vibration magnitudes in g
+        
+    Returns:
+        Dictionary with mean, std, rms, cv, min, max, peak_to_peak,
+        skewness, kurtosis and p25/p50/p75/p95 (all 0.0 for empty input)
+    """
+    x = np.ascontiguousarray(vib_mag, dtype=np.float32)
+    n = x.size
+    if n == 0:
+        return dict(_EMPTY_VIB_STATS)
+    
+    vib_min = float(x.min())
+    vib_max = float(x.max())
+    moments = compute_moments(x)
+    
+    p25, p50, p75, p95 = _partition_percentiles(x, (25, 50, 75, 95))
+    
+    return {
+        'mean': moments['mean'],
+        'std': moments['std'],
+        'rms': moments['rms'],
+        'cv': moments['cv'],
+        'min': vib_min,
+        'max': vib_max,
+        'peak_to_peak': vib_max - vib_min,
+        'skewness': moments['skewness'],
+        'kurtosis': moments['kurtosis'],
+        'p25': float(p25),
+        'p50': float(p50),
+        'p75': float(p75),
+        'p95': float(p95)
+    }
 